@@ -9,9 +9,159 @@ Created on Wed Mar 16 2022 at 15:37
 import numpy as np
 import math
 import csv
+import collections
+import collections.abc
+import functools
+import inspect
+import hashlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+import warnings
 
+# Version of the binary cache format written by "input_data"
+CACHE_VERSION = 2
+# Outranking relations coded as 1 * (σ(ai,bk) >= λ) + 2 * (σ(bk,ai) >= λ): incomparability 'R', preference of ai
+# over bk '>', preference of bk over ai '<' and indifference 'I'
+RELATIONS = np.array(['R', '>', '<', 'I'])
+# Maximum number of memoized results of the separability and requirements tests and of the stage functions
+MEMO_SIZE = 128
+# Maximum total size in bytes of the memoized results of the stage functions
+MEMO_BYTES = 2 ** 28
+# Maximum number of distinct performances of the actions on a criterion for its partial indices to be calculated once
+# per distinct value and gathered, see "lookup_table"
+LOOKUP_MAX_UNIQUE = 1024
 
-def input_data(name_W, name_AP, name_BP, name_T):
+
+class Problem:
+    """
+    Array-backed representation of the input data of an ELECTRE Tri-B problem. The weightings, performances and
+        thresholds are stored as contiguous float64 arrays, and the names of the criteria, actions and boundary
+        reference actions are kept with dictionaries giving their index in these arrays. The dictionaries used by the
+        other functions of this module stay available through the "to_dicts" method.
+
+    :param C: List containing the names of the criteria as strings.
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Array of shape (actions, criteria) containing the actions performances.
+    :param B: List containing the names of the boundary reference actions as strings.
+    :param BP: Array of shape (boundaries, criteria) containing the boundary reference actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds of each
+        criterion.
+    """
+
+    def __init__(self, C, W, A, AP, B, BP, T):
+        self.C = list(C)
+        self.A = list(A)
+        self.B = list(B)
+        self.W = np.ascontiguousarray(W, dtype=np.float64)
+        self.AP = np.ascontiguousarray(AP, dtype=np.float64)
+        self.BP = np.ascontiguousarray(BP, dtype=np.float64)
+        self.T = np.ascontiguousarray(T, dtype=np.float64)
+        if self.W.shape != (len(self.C),):
+            raise NameError('The weightings must contain one value for each criterion')
+        if self.AP.shape != (len(self.A), len(self.C)):
+            raise NameError('The actions performances must be of shape (actions, criteria)')
+        if self.BP.shape != (len(self.B), len(self.C)):
+            raise NameError('The boundary reference actions performances must be of shape (boundaries, criteria)')
+        if self.T.shape != (len(self.C), 3):
+            raise NameError('The thresholds must be of shape (criteria, 3)')
+        self.C_index = {c: j for j, c in enumerate(self.C)}
+        self.A_index = {a: i for i, a in enumerate(self.A)}
+        self.B_index = {b: k for k, b in enumerate(self.B)}
+
+    @classmethod
+    def from_dicts(cls, C, W, A, AP, B, BP, T):
+        """
+        Builds the array-backed problem from the lists and dictionaries returned by "input_data".
+
+        :param C: List containing the names of the criteria as strings.
+        :param W: Dictionary containing the weightings of each criterion.
+        :param A: List containing the names of the actions as strings.
+        :param AP: Actions performances dictionary.
+        :param B: List containing the names of the boundary reference actions as strings.
+        :param BP: Boundary reference actions performances dictionary.
+        :param T: Dictionary of thresholds.
+
+        :return: Problem instance containing the same data.
+        """
+        return cls(C,
+                   np.array([W[c] for c in C], dtype=np.float64),
+                   A,
+                   np.array([[AP[a][c] for c in C] for a in A], dtype=np.float64).reshape(len(A), len(C)),
+                   B,
+                   np.array([[BP[b][c] for c in C] for b in B], dtype=np.float64).reshape(len(B), len(C)),
+                   np.array([T[c] for c in C], dtype=np.float64).reshape(len(C), 3))
+
+    def with_actions(self, A, AP):
+        """
+        Builds a new problem sharing the criteria, weightings, boundary reference actions and thresholds of this one,
+            with other actions.
+
+        :param A: List containing the names of the actions as strings.
+        :param AP: Array of shape (actions, criteria) containing the actions performances.
+
+        :return: Problem instance.
+        """
+        return Problem(self.C, self.W, A, AP, self.B, self.BP, self.T)
+
+    def weights_dict(self):
+        """
+        :return W: Dictionary containing the weightings of each criterion.
+        """
+        return dict(zip(self.C, self.W.tolist()))
+
+    def actions_dict(self):
+        """
+        :return AP: Actions performances dictionary.
+        """
+        return {a: dict(zip(self.C, row)) for a, row in zip(self.A, self.AP.tolist())}
+
+    def boundaries_dict(self):
+        """
+        :return BP: Boundary reference actions performances dictionary.
+        """
+        return {b: dict(zip(self.C, row)) for b, row in zip(self.B, self.BP.tolist())}
+
+    def thresholds_dict(self):
+        """
+        :return T: Dictionary of thresholds.
+        """
+        return {c: tuple(row) for c, row in zip(self.C, self.T.tolist())}
+
+    def to_dicts(self):
+        """
+        Gives the legacy view of the problem used by the reference functions of this module.
+
+        :return: C, W, A, AP, B, BP, T as returned by "input_data".
+        """
+        return (list(self.C), self.weights_dict(), list(self.A), self.actions_dict(), list(self.B),
+                self.boundaries_dict(), self.thresholds_dict())
+
+
+def as_problem(C, W=None, A=None, AP=None, B=None, BP=None, T=None):
+    """
+    Gives the Problem instance corresponding to the input data, which can be given either as a Problem instance in
+        place of C or as the lists and dictionaries returned by "input_data".
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+
+    :return PB: Problem instance.
+    """
+    if isinstance(C, Problem):
+        return C
+    return Problem.from_dicts(C, W, A, AP, B, BP, T)
+
+
+def input_data(name_W, name_AP, name_BP, name_T, output='DICT', name_cache=None):
     """
     Generates the different input data in the correct format from .csv files.
 
@@ -24,6 +174,11 @@ def input_data(name_W, name_AP, name_BP, name_T):
     :param name_T: Name of the .csv file which must contain on the first line the names of the thresholds and on the
         following lines, for each criterion, the values of the indifference threshold, preference threshold and veto
         threshold.
+    :param output: Format of the returned data, "DICT" for the lists and dictionaries described below or "PROBLEM" for
+        a single array-backed Problem instance.
+    :param name_cache: Name of a directory used as binary cache of the parsed data. If it is given, the .csv files
+        are only parsed when the cache does not exist or when one of them has changed since the cache was written;
+        otherwise the data are loaded from the cache, the actions performances being memory-mapped.
 
     :return C: List containing the names of the criteria as strings.
     :return W: Dictionary containing the weightings of each criterion.
@@ -33,66 +188,340 @@ def input_data(name_W, name_AP, name_BP, name_T):
     :return BP: Boundary reference actions performances dictionary.
     :return T: Dictionary of thresholds.
     """
-    C = []
-    W = {}
-    A = []
-    AP = {}
-    B = []
-    BP = {}
-    T = {}
-    with open(name_W, 'r', newline='') as W_csv:
-        reader = csv.reader(W_csv, delimiter=',')
-        line_count = 0
-        for row in reader:
-            if line_count == 0:
-                [C.append(item) for item in row]
-            else:
-                for j in range(len(row)):
-                    W[C[j]] = float(row[j])
-            line_count += 1
-
-    with open(name_AP, 'r', newline='') as AP_csv:
-        reader = csv.reader(AP_csv, delimiter=',')
-        line_count = 0
-        for row in reader:
-            if line_count == 0:
-                [A.append(item) for item in row]
-            else:
-                perf_A = {}
-                for j in range(len(row)):
-                    perf_A[C[j]] = float(row[j])
-                AP[A[line_count-1]] = perf_A
-            line_count += 1
-
-    with open(name_BP, 'r', newline='') as BP_csv:
-        reader = csv.reader(BP_csv, delimiter=',')
-        line_count = 0
-        for row in reader:
-            if line_count == 0:
-                [B.append(item) for item in row]
-            else:
-                perf_B = {}
-                for j in range(len(row)):
-                    perf_B[C[j]] = float(row[j])
-                BP[B[line_count-1]] = perf_B
-            line_count += 1
-
-    with open(name_T, 'r', newline='') as T_csv:
-        reader = csv.reader(T_csv, delimiter=',')
-        line_count = 0
-        for row in reader:
-            if line_count == 0:
-                line_count += 1
-                continue
-            else:
-                perf_T = []
-                [perf_T.append(float(item)) for item in row]
-                T[C[line_count-1]] = tuple(perf_T)
-            line_count += 1
+    if output != 'DICT' and output != 'PROBLEM':
+        raise NameError('The variable "output" must be equal to "DICT" or "PROBLEM"')
+    if name_cache is None:
+        PB = input_boundaries(name_W, name_BP, name_T)
+        PB = PB.with_actions(*input_actions(name_AP, PB.C))
+    else:
+        PB = _load_cache(name_cache, name_W, name_AP, name_BP, name_T)
+        if PB is None:
+            PB = input_data(name_W, name_AP, name_BP, name_T, output='PROBLEM')
+            _save_cache(name_cache, PB, name_W, name_AP, name_BP, name_T)
+    if output == 'PROBLEM':
+        return PB
+    return PB.to_dicts()
+
+
+def input_boundaries(name_W, name_BP, name_T):
+    """
+    Generates the part of the input data which does not depend on the actions, i.e. the criteria, weightings,
+        boundary reference actions and thresholds, from the same .csv files as "input_data".
+
+    :param name_W: Name of the .csv file containing the names of the criteria and the weightings.
+    :param name_BP: Name of the .csv file containing the names and performances of the boundaries actions.
+    :param name_T: Name of the .csv file containing the thresholds of each criterion.
+
+    :return PB: Problem instance without actions.
+    """
+    C, W = _read_csv(name_W)
+    B, BP = _read_csv(name_BP, len(C))
+    _, T = _read_csv(name_T, 3)
+    return Problem(C, W.reshape(len(C)), [], np.empty((0, len(C))), B, BP, T)
+
+
+def input_actions(name_AP, C):
+    """
+    Reads the actions performances from the same .csv file as "input_data", as an array.
+
+    :param name_AP: Name of the .csv file containing the names and performances of the actions.
+    :param C: List containing the names of the criteria as strings.
+
+    :return A: List containing the names of the actions as strings.
+    :return AP: Array of shape (actions, criteria) containing the actions performances.
+    """
+    return _read_csv(name_AP, len(C))
+
+
+def _read_csv(name, columns=None):
+    """
+    Reads a .csv file made of a first line of names followed by lines of numbers, parsing the numbers in bulk
+        directly into an array.
+
+    :param name: Name of the .csv file.
+    :param columns: Expected number of values on each line of numbers, if known.
+
+    :return names: List of the names written on the first line.
+    :return values: Array of shape (lines, columns) containing the numbers.
+    """
+    with open(name, 'r', newline='') as csv_file:
+        names = next(csv.reader([csv_file.readline()], delimiter=','), [])
+        with warnings.catch_warnings():
+            # An empty body gives an empty array, reshaped below
+            warnings.simplefilter('ignore', UserWarning)
+            values = np.loadtxt(csv_file, delimiter=',', dtype=np.float64, ndmin=2)
+    if columns is not None:
+        if values.size == 0:
+            values = values.reshape(0, columns)
+        elif values.shape[1] != columns:
+            raise NameError('Each line of numbers of the file {} must contain {} values'.format(name, columns))
+    return names, values
+
+
+def _source_signature(names):
+    """
+    :param names: Names of the source .csv files.
+
+    :return: List giving for each file its absolute path, size and time of last modification, used to detect any
+        change of the source files of a cache.
+    """
+    signature = []
+    for name in names:
+        stat = os.stat(name)
+        signature.append([os.path.abspath(name), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def _source_digests(names):
+    """
+    :param names: Names of the source .csv files.
+
+    :return: List of the hashes of the content of the files, used to detect the changes which keep the size and time
+        of last modification of a file, e.g. a copy preserving the timestamps.
+    """
+    digests = []
+    for name in names:
+        h = hashlib.sha1()
+        with open(name, 'rb') as source_file:
+            for block in iter(lambda: source_file.read(2 ** 20), b''):
+                h.update(block)
+        digests.append(h.hexdigest())
+    return digests
+
+
+def _save_cache(name_cache, PB, name_W, name_AP, name_BP, name_T):
+    """
+    Writes the arrays of a problem in a binary cache directory: one .npy file per array and a small header.json file
+        containing the names, the signature and the hashes of the content of the source .csv files. The header is
+        written last so that an interrupted writing never leaves a cache that looks valid.
+
+    :param name_cache: Name of the cache directory.
+    :param PB: Problem instance to cache.
+    :param name_W: Name of the .csv file of the weightings.
+    :param name_AP: Name of the .csv file of the actions performances.
+    :param name_BP: Name of the .csv file of the boundary reference actions performances.
+    :param name_T: Name of the .csv file of the thresholds.
+    """
+    os.makedirs(name_cache, exist_ok=True)
+    header = os.path.join(name_cache, 'header.json')
+    if os.path.exists(header):
+        os.remove(header)
+    for key in ('W', 'AP', 'BP', 'T'):
+        np.save(os.path.join(name_cache, key + '.npy'), getattr(PB, key))
+    with open(header + '.tmp', 'w', encoding='utf-8') as header_file:
+        names = [name_W, name_AP, name_BP, name_T]
+        json.dump({'version': CACHE_VERSION, 'C': PB.C, 'A': PB.A, 'B': PB.B,
+                   'sources': _source_signature(names), 'digests': _source_digests(names)}, header_file)
+    os.replace(header + '.tmp', header)
+
+
+def _load_cache(name_cache, name_W, name_AP, name_BP, name_T):
+    """
+    Loads a problem from a binary cache directory written by "_save_cache". The actions performances are
+        memory-mapped rather than read. The content of the source .csv files is only hashed when their size and time
+        of last modification are the ones of the cache, the other changes being detected without reading them.
+
+    :param name_cache: Name of the cache directory.
+    :param name_W: Name of the .csv file of the weightings.
+    :param name_AP: Name of the .csv file of the actions performances.
+    :param name_BP: Name of the .csv file of the boundary reference actions performances.
+    :param name_T: Name of the .csv file of the thresholds.
+
+    :return PB: Problem instance, or None if there is no cache or if any of the source .csv files has changed.
+    """
+    try:
+        with open(os.path.join(name_cache, 'header.json'), 'r', encoding='utf-8') as header_file:
+            header = json.load(header_file)
+    except (OSError, ValueError):
+        return None
+    names = [name_W, name_AP, name_BP, name_T]
+    if header.get('version') != CACHE_VERSION or header.get('sources') != _source_signature(names) or \
+            header.get('digests') != _source_digests(names):
+        return None
+    arrays = {}
+    for key in ('W', 'AP', 'BP', 'T'):
+        arrays[key] = np.load(os.path.join(name_cache, key + '.npy'), mmap_mode='r' if key == 'AP' else None)
+    return Problem(header['C'], arrays['W'], header['A'], arrays['AP'], header['B'], arrays['BP'], arrays['T'])
+
+
+def content_hash(*DATA):
+    """
+    Calculates a hash of the content of lists of names, arrays of numbers and dictionaries of them, used as key of the
+        memoized results. The dictionaries are hashed in the order of their keys, as the order of the keys can change
+        the rounding of the results, for example of the sum of the weightings.
+
+    :param DATA: Lists of strings, strings, arrays, numbers and dictionaries, in any number.
+
+    :return: Hexadecimal string of the hash.
+    """
+    h = hashlib.sha1()
+    for item in DATA:
+        _update_hash(h, item)
+        h.update(b'\x1e')
+    return h.hexdigest()
+
+
+def _update_hash(h, item):
+    """
+    Adds the content of an item to the hash h.
+    """
+    if isinstance(item, str):
+        h.update(item.encode('utf-8'))
+    elif isinstance(item, dict):
+        keys = list(item)
+        h.update('\x1f'.join(str(key) for key in keys).encode('utf-8'))
+        h.update(b'\x1d')
+        values = [item[key] for key in keys]
+        # Dictionaries of numbers, like the performances of an action, are hashed as a single array
+        if all(isinstance(value, (int, float, np.number)) for value in values):
+            _update_hash(h, np.array(values, dtype=np.float64))
+        else:
+            for value in values:
+                _update_hash(h, value)
+                h.update(b'\x1d')
+    elif isinstance(item, (list, tuple)) and all(isinstance(name, str) for name in item):
+        h.update('\x1f'.join(item).encode('utf-8'))
+    else:
+        item = np.ascontiguousarray(item, dtype=np.float64)
+        h.update(str(item.shape).encode('utf-8'))
+        h.update(item.tobytes())
+
+
+def _nbytes(value):
+    """
+    :return: Approximate size in bytes of a memoized value made of arrays, lists, dictionaries and numbers.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    return 8
+
+
+def _copy(value):
+    """
+    :return: Copy of a memoized value, so that the caller cannot modify the memoized one.
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class Memo:
+    """
+    Memoization cache evicting the least recently used results beyond a number of entries or a total size, with
+        counters of the hits and misses.
+
+    :param max_size: Maximum number of memoized results, or None for no limit. With 0, nothing is memoized.
+    :param max_bytes: Maximum total size in bytes of the memoized results, or None for no limit.
+    """
+
+    def __init__(self, max_size=MEMO_SIZE, max_bytes=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.Hits = 0
+        self.Misses = 0
+        self.Bytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        :return: Value memoized for the key, or None. The key is marked as the most recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.Misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.Hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        Memoizes a value, removing the least recently used values beyond max_size entries or max_bytes bytes.
+        """
+        nbytes = _nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.Bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.Bytes += nbytes
+            while self._entries and ((self.max_size is not None and len(self._entries) > self.max_size) or
+                                     (self.max_bytes is not None and self.Bytes > self.max_bytes)):
+                self.Bytes -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        """
+        Removes all the memoized values and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.Bytes = 0
+            self.Hits = 0
+            self.Misses = 0
+
+    def info(self):
+        """
+        :return: Dictionary with the numbers of hits ('hits') and misses ('misses'), the number of memoized results
+            ('size') and their total size in bytes ('bytes').
+        """
+        with self._lock:
+            return {'hits': self.Hits, 'misses': self.Misses, 'size': len(self._entries), 'bytes': self.Bytes}
+
+
+_SEPARABILITY_CACHE = Memo(MEMO_SIZE)
+_REQUIREMENTS_CACHE = Memo(MEMO_SIZE)
 
-    return C, W, A, AP, B, BP, T
 
+def clear_requirements_cache():
+    """
+    Removes the memoized results of "separability_test" and "requirements_test", for example to measure the time of
+        the tests.
+    """
+    _SEPARABILITY_CACHE.clear()
+    _REQUIREMENTS_CACHE.clear()
+
+
+# Memoized results of the stage functions "concordance", "discordance", "global_concordance" and "credibility"
+STAGE_MEMO = Memo(MEMO_SIZE, MEMO_BYTES)
+
+
+def _memoized(function):
+    """
+    Decorator memoizing the results of a stage function in STAGE_MEMO on a hash of the content of its arguments, so
+        that repeated calls with the same data return immediately. The arguments given by keyword are put back in the
+        order of the signature, so that they give the same key as positional arguments. The memoized results are copied
+        on each call. The original function stays available as the attribute "__wrapped__".
+    """
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if STAGE_MEMO.max_size == 0:
+            return function(*args, **kwargs)
+        args = signature.bind(*args, **kwargs).args
+        key = content_hash(function.__name__, *args)
+        value = STAGE_MEMO.get(key)
+        if value is None:
+            value = function(*args)
+            STAGE_MEMO.put(key, _copy(value))
+            return value
+        return _copy(value)
+    return wrapper
 
+
+@_memoized
 def concordance(C, A, AP, b, BP, T):
     """
     Calculates the concordance matrix for a given boundary reference action.
@@ -120,6 +549,7 @@ def concordance(C, A, AP, b, BP, T):
     return Concordance
 
 
+@_memoized
 def discordance(C, A, AP, b, BP, T):
     """
     Calculates the discordance matrix for a given boundary reference action.
@@ -147,6 +577,124 @@ def discordance(C, A, AP, b, BP, T):
     return Discordance
 
 
+def partial_indices(C, A, AP, B, BP, T):
+    """
+    Calculates the concordance and discordance indices of all the actions with regard to all the boundary reference
+        actions in a single vectorized pass over an (actions x boundaries x criteria) tensor. The values are the same
+        as the ones given by the "concordance" and "discordance" functions, which remain the reference.
+
+    :param C: List containing the names of the criteria as strings.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Performances dictionary of the boundary reference actions.
+    :param T: Dictionary of thresholds.
+
+    :return Conc_ab: Array of shape (actions, boundaries, criteria) containing the concordance indices c(ai,bk).
+    :return Conc_ba: Array of shape (actions, boundaries, criteria) containing the concordance indices c(bk,ai).
+    :return Disc_ab: Array of shape (actions, boundaries, criteria) containing the discordance indices d(ai,bk).
+    :return Disc_ba: Array of shape (actions, boundaries, criteria) containing the discordance indices d(bk,ai).
+    """
+    G_A = np.array([[AP[a][c] for c in C] for a in A], dtype=np.float64).reshape(len(A), len(C))
+    G_B = np.array([[BP[b][c] for c in C] for b in B], dtype=np.float64).reshape(len(B), len(C))
+    T_array = np.array([T[c] for c in C], dtype=np.float64).reshape(len(C), 3)
+    return partial_indices_arrays(G_A, G_B, T_array)
+
+
+def lookup_table(G, max_unique=None):
+    """
+    Detects whether the performances of the actions on a criterion take few distinct values, e.g. discrete scores, in
+        which case their partial indices only need to be calculated once per distinct value. A first block of the
+        performances is tested before the whole column is sorted, so that the criteria with many distinct values are
+        ruled out at a small cost.
+
+    :param G: Array of shape (actions,) containing the performances of the actions on a criterion.
+    :param max_unique: Maximum number of distinct values, LOOKUP_MAX_UNIQUE if None. The distinct values must also be
+        at most a quarter of the actions.
+
+    :return: Tuple (Values, Index) of the sorted distinct values and of the index of the value of each action, such
+        that G = Values[Index], or None if the criterion has too many distinct values.
+    """
+    if max_unique is None:
+        max_unique = LOOKUP_MAX_UNIQUE
+    limit = min(max_unique, len(G) // 4)
+    if limit < 1 or len(np.unique(G[:4 * limit])) > limit:
+        return None
+    Values, Index = np.unique(G, return_inverse=True)
+    return (Values, Index.reshape(-1)) if len(Values) <= limit else None
+
+
+def _by_criterion(function, G_A, G_B, T, Lookups):
+    """
+    Applies a function calculating arrays of shape (actions, boundaries, criteria) from the performances and the
+        thresholds, such as "partial_indices_arrays", once per distinct value on the criteria having a lookup table and
+        on all the actions for the other criteria. The values are the same as if the function was applied directly.
+
+    :return: List of the arrays given by the function.
+    """
+    n, k, m = G_A.shape[0], G_B.shape[0], G_A.shape[1]
+    Dense = [j for j in range(m) if Lookups[j] is None]
+    if len(Dense) == m:
+        return list(function(G_A, G_B, T))
+    Tables = {j: function(Lookups[j][0][:, np.newaxis], G_B[:, j:j + 1], T[j:j + 1]) for j in range(m)
+              if Lookups[j] is not None}
+    # The arrays are stored criterion by criterion, so that the values of each criterion are gathered in a contiguous
+    # block, and are returned as views of shape (actions, boundaries, criteria)
+    Results = [np.empty((m, n, k), dtype=Table.dtype) for Table in next(iter(Tables.values()))]
+    if len(Dense) > 0:
+        for Result, Array in zip(Results, function(G_A[:, Dense], G_B[:, Dense], T[Dense])):
+            Result[Dense] = Array.transpose(2, 0, 1)
+    for j, Table_j in Tables.items():
+        for Result, Table in zip(Results, Table_j):
+            np.take(Table[:, :, 0], Lookups[j][1], axis=0, out=Result[j])
+    return [Result.transpose(1, 2, 0) for Result in Results]
+
+
+def partial_indices_arrays(G_A, G_B, T, max_unique=None):
+    """
+    Array version of "partial_indices" working directly on the arrays of a Problem instance. The partial indices of
+        the criteria taking few distinct values (see "lookup_table") are calculated once per distinct value and
+        boundary reference action, then gathered for all the actions, with the same values.
+
+    :param G_A: Array of shape (actions, criteria) containing the actions performances.
+    :param G_B: Array of shape (boundaries, criteria) containing the boundary reference actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds.
+    :param max_unique: Maximum number of distinct values of a criterion for the lookup tables, LOOKUP_MAX_UNIQUE if
+        None, or 0 to calculate the indices of all the actions directly.
+
+    :return: Conc_ab, Conc_ba, Disc_ab, Disc_ba arrays of shape (actions, boundaries, criteria).
+    """
+    Lookups = [lookup_table(G_A[:, j], max_unique) for j in range(G_A.shape[1])]
+    return tuple(_by_criterion(_partial_indices, G_A, G_B, T, Lookups))
+
+
+def _concordance_indices(G_A, G_B, T):
+    """
+    Calculation of the concordance indices of "partial_indices_arrays" on all the actions.
+    """
+    g_a = G_A[:, np.newaxis, :]
+    g_b = G_B[np.newaxis, :, :]
+    q, p = T[:, 0], T[:, 1]
+    # The operations are written in the same order as in the reference functions to give identical values
+    Conc_ab = np.clip((g_a - g_b + p) / (p - q), 0, 1)
+    Conc_ba = np.clip((g_b - g_a + p) / (p - q), 0, 1)
+    return Conc_ab, Conc_ba
+
+
+def _partial_indices(G_A, G_B, T):
+    """
+    Calculation of "partial_indices_arrays" on all the actions.
+    """
+    Conc_ab, Conc_ba = _concordance_indices(G_A, G_B, T)
+    g_a = G_A[:, np.newaxis, :]
+    g_b = G_B[np.newaxis, :, :]
+    p, v = T[:, 1], T[:, 2]
+    Disc_ab = np.clip((g_b - g_a - p) / (v - p), 0, 1)
+    Disc_ba = np.clip((g_a - g_b - p) / (v - p), 0, 1)
+    return Conc_ab, Conc_ba, Disc_ab, Disc_ba
+
+
+@_memoized
 def global_concordance(CONC, b, C, W, A):
     """
     Calculates the global concordances vectors for a given boundary reference action using a given concordance matrix.
@@ -174,6 +722,7 @@ def global_concordance(CONC, b, C, W, A):
     return Global_concordance
 
 
+@_memoized
 def credibility(GLOB_CONC, b, DISC, C, A):
     """
     Calculates the credibility vectors for a given boundary reference action using the global concordance vector and
@@ -211,6 +760,199 @@ def credibility(GLOB_CONC, b, DISC, C, A):
     return Credibility
 
 
+def global_concordance_arrays(CONC_AB, CONC_BA, W):
+    """
+    Calculates the global concordance indices of all the actions with regard to all the boundary reference actions
+        from the arrays returned by "partial_indices". The weighted sum is accumulated criterion by criterion, in the
+        same order as in the "global_concordance" function, so that the values are identical.
+
+    :param CONC_AB: Array of shape (actions, boundaries, criteria) containing the concordance indices c(ai,bk).
+    :param CONC_BA: Array of shape (actions, boundaries, criteria) containing the concordance indices c(bk,ai).
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+
+    :return Glob_ab: Array of shape (actions, boundaries) containing the global concordance indices C(ai,bk).
+    :return Glob_ba: Array of shape (actions, boundaries) containing the global concordance indices C(bk,ai).
+    """
+    sum_W = sum(W.tolist())
+    Glob_ab = np.zeros(CONC_AB.shape[:-1])
+    Glob_ba = np.zeros(CONC_BA.shape[:-1])
+    for j in range(len(W)):
+        Glob_ab = Glob_ab + (W[j] * CONC_AB[..., j]) / sum_W
+        Glob_ba = Glob_ba + (W[j] * CONC_BA[..., j]) / sum_W
+    return Glob_ab, Glob_ba
+
+
+def credibility_arrays(GLOB_AB, GLOB_BA, DISC_AB, DISC_BA):
+    """
+    Calculates the credibility indices of all the actions with regard to all the boundary reference actions from the
+        arrays of global concordance and discordance indices. The products are taken criterion by criterion, in the
+        same order as in the "credibility" function, so that the values are identical.
+
+    :param GLOB_AB: Array of shape (actions, boundaries) containing the global concordance indices C(ai,bk).
+    :param GLOB_BA: Array of shape (actions, boundaries) containing the global concordance indices C(bk,ai).
+    :param DISC_AB: Array of shape (actions, boundaries, criteria) containing the discordance indices d(ai,bk).
+    :param DISC_BA: Array of shape (actions, boundaries, criteria) containing the discordance indices d(bk,ai).
+
+    :return Cred_ab: Array of shape (actions, boundaries) containing the credibility indices σ(ai,bk).
+    :return Cred_ba: Array of shape (actions, boundaries) containing the credibility indices σ(bk,ai).
+    """
+    cr_ab = np.ones(GLOB_AB.shape)
+    cr_ba = np.ones(GLOB_BA.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j in range(DISC_AB.shape[-1]):
+            d_ab = DISC_AB[..., j]
+            d_ba = DISC_BA[..., j]
+            cr_ab = np.where(d_ab > GLOB_AB, cr_ab * (1 - d_ab) / (1 - GLOB_AB), cr_ab)
+            cr_ba = np.where(d_ba > GLOB_BA, cr_ba * (1 - d_ba) / (1 - GLOB_BA), cr_ba)
+    return cr_ab * GLOB_AB, cr_ba * GLOB_BA
+
+
+def partial_indices_sparse(G_A, G_B, T, max_unique=None):
+    """
+    Version of "partial_indices_arrays" giving the discordance indices as sparse vetoes. A discordance index is only
+        non-zero when the difference of performances exceeds the preference threshold, which is rare in most data:
+        the discordance indices are only calculated, criterion by criterion, for these pairs. Each veto is a tuple
+        (Pairs, Criteria, Values) of arrays sorted by criterion, in which Pairs contains the flat indices of the
+        (action, boundary) pairs in an array of shape (actions, boundaries), Criteria the indices of the criteria and
+        Values the non-zero discordance indices, with the same values as in "partial_indices_arrays". The lookup
+        tables of the criteria taking few distinct values are used as in "partial_indices_arrays".
+
+    :param G_A: Array of shape (actions, criteria) containing the actions performances.
+    :param G_B: Array of shape (boundaries, criteria) containing the boundary reference actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds.
+    :param max_unique: Maximum number of distinct values of a criterion for the lookup tables (see "lookup_table").
+
+    :return Conc_ab: Array of shape (actions, boundaries, criteria) containing the concordance indices c(ai,bk).
+    :return Conc_ba: Array of shape (actions, boundaries, criteria) containing the concordance indices c(bk,ai).
+    :return Veto_ab: Sparse veto of the non-zero discordance indices d(ai,bk).
+    :return Veto_ba: Sparse veto of the non-zero discordance indices d(bk,ai).
+    """
+    Lookups = [lookup_table(G_A[:, j], max_unique) for j in range(G_A.shape[1])]
+    Conc_ab, Conc_ba = _by_criterion(_concordance_indices, G_A, G_B, T, Lookups)
+    p, v = T[:, 1], T[:, 2]
+    Veto_ab = ([], [], [])
+    Veto_ba = ([], [], [])
+    for j in range(G_A.shape[1]):
+        if Lookups[j] is None:
+            g_a, Index = G_A[:, j, np.newaxis], slice(None)
+        else:
+            g_a, Index = Lookups[j][0][:, np.newaxis], Lookups[j][1]
+        g_b = G_B[np.newaxis, :, j]
+        for Veto, Difference in ((Veto_ab, (g_b - g_a - p[j])[Index]), (Veto_ba, (g_a - g_b - p[j])[Index])):
+            Pairs = np.flatnonzero(Difference > 0)
+            Values = np.clip(Difference.reshape(-1)[Pairs] / (v[j] - p[j]), 0, 1)
+            Veto[0].append(Pairs[Values > 0])
+            Veto[1].append(np.full(np.count_nonzero(Values > 0), j))
+            Veto[2].append(Values[Values > 0])
+    Veto_ab = tuple(np.concatenate(Veto) if len(Veto) > 0 else np.zeros(0) for Veto in Veto_ab)
+    Veto_ba = tuple(np.concatenate(Veto) if len(Veto) > 0 else np.zeros(0) for Veto in Veto_ba)
+    return Conc_ab, Conc_ba, Veto_ab, Veto_ba
+
+
+def credibility_sparse(GLOB_AB, GLOB_BA, VETO_AB, VETO_BA):
+    """
+    Version of "credibility_arrays" working on the sparse vetoes given by "partial_indices_sparse". The credibility
+        index of the pairs without any veto is equal to their global concordance index, and the products are only
+        taken for the pairs having at least one non-zero discordance index, criterion by criterion in the same order
+        as in the "credibility" function, so that the values are identical. The cost of the products is proportional to
+        the number of non-zero discordance indices.
+
+    :param GLOB_AB: Array of shape (actions, boundaries) containing the global concordance indices C(ai,bk).
+    :param GLOB_BA: Array of shape (actions, boundaries) containing the global concordance indices C(bk,ai).
+    :param VETO_AB: Sparse veto of the non-zero discordance indices d(ai,bk).
+    :param VETO_BA: Sparse veto of the non-zero discordance indices d(bk,ai).
+
+    :return Cred_ab: Array of shape (actions, boundaries) containing the credibility indices σ(ai,bk).
+    :return Cred_ba: Array of shape (actions, boundaries) containing the credibility indices σ(bk,ai).
+    """
+    Cred = []
+    for GLOB, (Pairs, Criteria, Values) in ((GLOB_AB, VETO_AB), (GLOB_BA, VETO_BA)):
+        Glob = GLOB.reshape(-1)
+        cr = np.ones(Glob.shape)
+        Limits = np.flatnonzero(np.diff(Criteria)) + 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for Pos, d in zip(np.split(Pairs.astype(np.int64), Limits), np.split(Values, Limits)):
+                cr[Pos] = np.where(d > Glob[Pos], cr[Pos] * (1 - d) / (1 - Glob[Pos]), cr[Pos])
+        Cred.append((cr * Glob).reshape(GLOB.shape))
+    return Cred[0], Cred[1]
+
+
+def credibility_indices(G_A, G_B, T, W, Stages=None, stats=None, boundary=None):
+    """
+    Calculates the credibility indices of all the actions with regard to all the boundary reference actions with the
+        stages of a backend, for the calculations which do not need the discordance indices themselves. The sparse
+        vetoes of "partial_indices_sparse" and "credibility_sparse" are used when the backend gives them.
+
+    :param G_A: Array of shape (actions, criteria) containing the actions performances.
+    :param G_B: Array of shape (boundaries, criteria) containing the boundary reference actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds.
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+    :param Stages: Dictionary of the stages of a backend (see "get_backend"), the default backend if None.
+    :param stats: Stats instance or function recording the measures of each stage (see "ELECTRE_Tri_B").
+    :param boundary: Index of the boundary reference action when G_B contains a single one, recorded in stats.
+
+    :return Cred_ab: Array of shape (actions, boundaries) containing the credibility indices σ(ai,bk).
+    :return Cred_ba: Array of shape (actions, boundaries) containing the credibility indices σ(bk,ai).
+    """
+    if Stages is None:
+        Stages = get_backend()
+    sparse = 'sparse_partial_indices' in Stages
+    partial_indices = Stages['sparse_partial_indices'] if sparse else Stages['partial_indices']
+    credibility = Stages['sparse_credibility'] if sparse else Stages['credibility']
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = traced(stats, 'partial_indices', partial_indices, G_A, G_B, T,
+                                                boundary=boundary)
+    Glob_ab, Glob_ba = traced(stats, 'global_concordance', Stages['global_concordance'], Conc_ab, Conc_ba, W,
+                              boundary=boundary)
+    del Conc_ab, Conc_ba
+    return traced(stats, 'credibility', credibility, Glob_ab, Glob_ba, Disc_ab, Disc_ba, boundary=boundary)
+
+
+def concordance_thresholds(DISC, x, iterations=60):
+    """
+    For fixed discordance indices, the credibility index σ = C * Π min(1, (1 - dj) / (1 - C)) is a continuous
+        increasing function of the global concordance index C, so that the condition σ >= x is equivalent to C >= C_x.
+        C_x is x when no discordance index exceeds x. For the other pairs, the discordance indices are sorted: between
+        two consecutive ones, σ = C * P / (1 - C) ** r where P is the product of the (1 - dj) of the r discordance
+        indices above C, which gives the interval containing C_x. C_x is then found in this interval by bisection on
+        the "credibility_arrays" function, so that it follows the calculation of the credibility indices exactly.
+
+    :param DISC: Array of shape (..., criteria) containing the discordance indices of the pairs.
+    :param x: Credibility value in ]0, 1].
+    :param iterations: Maximum number of steps of the bisection.
+
+    :return C_min: Array of shape (...) containing the smallest global concordance index of each pair for which its
+        credibility index reaches x, equal to 1 if a veto forbids it.
+    """
+    C_min = np.full(DISC.shape[:-1], float(x))
+    m = DISC.shape[-1]
+    Rows = np.flatnonzero(DISC.max(axis=-1, initial=0) > x)
+    DISC = DISC.reshape(-1, m)[Rows]
+    # Only the discordance indices above x can exceed a threshold which is at least x
+    D = np.maximum(np.sort(DISC, axis=1), x)
+    Products = np.ones((len(Rows), m + 1))
+    Products[:, :m] = np.cumprod((1 - D)[:, ::-1], axis=1)[:, ::-1]
+    Left = np.concatenate([np.full((len(Rows), 1), float(x)), D], axis=1)
+    Powers = np.arange(m, -1, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Values = np.where(Left < 1, Left * Products / (1 - Left) ** Powers, 1)
+    # Last interval [Left[k], Left[k + 1]] whose lower end is below x
+    k = m - np.argmax((Values < x)[:, ::-1], axis=1)
+    i = np.arange(len(Rows))
+    Low = Left[i, k]
+    High = np.where(k < m, Left[i, np.minimum(k + 1, m)], 1)
+    # The ends of the intervals are calculated with the closed form of σ, and may round differently
+    High = np.where(credibility_arrays(High, High, DISC, DISC)[0] >= x, High, 1)
+    for _ in range(iterations):
+        Mid = (Low + High) / 2
+        if not ((Mid > Low) & (Mid < High)).any():
+            break
+        reached = credibility_arrays(Mid, Mid, DISC, DISC)[0] >= x
+        Low = np.where(reached, Low, Mid)
+        High = np.where(reached, Mid, High)
+    np.put(C_min, Rows, High)
+    return C_min
+
+
 def over_ranking_relations(CRED, b, λ):
     """
     Built the over ranking relations matrix using the credibility vectors and the cutting threshold. The result is a
@@ -228,15 +970,17 @@ def over_ranking_relations(CRED, b, λ):
         reference actions, représenting the limits and boundaries of the different categories.
     """
     over_ranking = []
+    cred_1 = CRED['σ(ai,{})'.format(b)]
+    cred_2 = CRED['σ({},ai)'.format(b)]
 
-    for i in range(len(CRED['σ(ai,{})'.format(b)])):
-        if CRED['σ(ai,{})'.format(b)][i] >= λ:
-            if CRED['σ({},ai)'.format(b)][i] >= λ:
+    for i in range(len(cred_1)):
+        if cred_1[i] >= λ:
+            if cred_2[i] >= λ:
                 over_ranking.append('I')
             else:
                 over_ranking.append('>')
         else:
-            if CRED['σ({},ai)'.format(b)][i] >= λ:
+            if cred_2[i] >= λ:
                 over_ranking.append('<')
             else:
                 over_ranking.append('R')
@@ -330,9 +1074,41 @@ def display_results(PESSI_SORT, OPTI_SORT, MED_RANK, A):
               str(PESSI_SORT[1][a]) + ' with a median rank of ' + str(MED_RANK[a]))
 
 
+def separability_arrays(W, BP, T):
+    """
+    Calculates only the credibility indices σ(bk-1,bk) of the pairs of consecutive boundary reference actions used by
+        the separability test, with the same values as the complete calculation of the indices of all the boundary
+        reference actions against each other.
+
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+    :param BP: Array of shape (boundaries, criteria) containing the boundary reference actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds.
+
+    :return Cred_bk: List of the credibility indices σ(bk-1,bk) for k = 1, 2, ...
+    """
+    q, p, v = T[:, 0], T[:, 1], T[:, 2]
+    Conc_bk = np.clip((BP[:-1] - BP[1:] + p) / (p - q), 0, 1)
+    Disc_bk = np.clip((BP[1:] - BP[:-1] - p) / (v - p), 0, 1)
+    Glob_bk, _ = global_concordance_arrays(Conc_bk, Conc_bk, W)
+    Cred_bk, _ = credibility_arrays(Glob_bk, Glob_bk, Disc_bk, Disc_bk)
+    return Cred_bk.tolist()
+
+
+def _boundary_arrays(C, W, B, BP, T):
+    """
+    :return: Arrays of the weightings, boundary reference actions performances and thresholds given as dictionaries.
+    """
+    W_array = np.array([W[c] for c in C], dtype=np.float64)
+    BP_array = np.array([[BP[b][c] for c in C] for b in B], dtype=np.float64).reshape(len(B), len(C))
+    T_array = np.array([T[c] for c in C], dtype=np.float64).reshape(len(C), 3)
+    return W_array, BP_array, T_array
+
+
 def separability_test(C, W, B, BP, T, display='NO'):
     """
-    Calculates the minimum required credibility threshold.
+    Calculates the minimum required credibility threshold. The credibility indices of the pairs of consecutive boundary
+        reference actions are memoized on a hash of the content of C, W, B, BP and T, so that the repeated tests
+        on the same boundary reference actions do not recalculate them.
 
     :param C: List containing the names of the criteria as strings.
     :param W: Dictionary containing the weightings of each criterion.
@@ -345,14 +1121,15 @@ def separability_test(C, W, B, BP, T, display='NO'):
         like (bk,bk+1). The keys are 'S(b0,b1)', 'S(b1,b2)', 'S(b2,b3)', etc.
     :return Separability: Variable stating whether the separability is "Weak", "Strict" or "Hyper-strict".
     """
-    Sigma_bk = {}
+    W_array, BP_array, T_array = _boundary_arrays(C, W, B, BP, T)
+    key = content_hash(C, B, W_array, BP_array, T_array)
+    Sigma_bk = _SEPARABILITY_CACHE.get(key)
+    if Sigma_bk is None:
+        Cred_bk = separability_arrays(W_array, BP_array, T_array)
+        Sigma_bk = {'σ({},{})'.format(B[b - 1], B[b]): Cred_bk[b - 1] for b in range(1, len(B), 1)}
+        _SEPARABILITY_CACHE.put(key, Sigma_bk)
+    Sigma_bk = dict(Sigma_bk)
     Separability = ''
-    for b in range(1, len(B), 1):
-        conc = concordance(C, B, BP, B[b], BP, T)
-        disc = discordance(C, B, BP, B[b], BP, T)
-        glob_conc = global_concordance(conc, B[b], C, W, B)
-        cred = credibility(glob_conc, B[b], disc, C, B)
-        Sigma_bk['σ({},{})'.format(B[b - 1], B[b])] = cred['σ(ai,{})'.format(B[b])][b - 1]
     if max(Sigma_bk.values()) == 0:
         Separability = 'Hyper-strict'
         if display == 'YES':
@@ -383,25 +1160,51 @@ def separability_test(C, W, B, BP, T, display='NO'):
     return Sigma_bk, Separability
 
 
-def ELECTRE_Tri_B(C, W, A, AP, B, BP, T, CAT, λ, display='NO'):
+def requirements_test(C, W, B, BP, T, λ):
     """
-    Upper function to execute the ELECTRE method by calling each of the elementary functions in the order
-        they should be called. The input data are described below.
+    Tests the minimum requirements to run the ELECTRE Tri-B method: normalized weightings, increasing thresholds,
+        separability of the boundary reference actions and cutting threshold at least equal to the minimum required
+        credibility threshold. The tests which do not depend on the cutting threshold are memoized on a hash of the
+        content of C, W, B, BP and T, so that repeated classifications against the same boundary reference actions
+        skip them.
 
     :param C: List containing the names of the criteria as strings.
     :param W: Dictionary containing the weightings of each criterion.
-    :param A: List containing the names of the actions as strings.
-    :param AP: Actions performances dictionary.
     :param B: List containing the names of the boundary reference actions.
-    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param BP: Performances dictionary of the boundary reference actions.
     :param T: Dictionary of thresholds.
-    :param CAT: List of the names of the different categories in which the actions will be classified.
     :param λ: Cutting threshold value.
-    :param display: Parameter allowing to choose if the display of the results and comments is desired or not.
 
-    :return: Conc, Disc, Glob_conc, Cred, Over_rank, Pessi_sort, Opti_sort, Med_rank, Sigma_bk, Separability
+    :return Sigma_bk: Dictionary containing the credibility index values for the pairs of boundary reference actions.
+    :return Separability: Variable stating whether the separability is "Weak", "Strict" or "Hyper-strict".
+    """
+    key = content_hash(C, B, *_boundary_arrays(C, W, B, BP, T))
+    requirements = _REQUIREMENTS_CACHE.get(key)
+    if requirements is None:
+        requirements = boundary_requirements(C, W, B, BP, T)
+        _REQUIREMENTS_CACHE.put(key, requirements)
+    Sigma_bk, Separability = dict(requirements[0]), requirements[1]
+    if λ < max(Sigma_bk.values()):
+        raise NameError('The chosen credibility threshold is lower than the minimum required credibility threshold '
+                        'λ_min = {}'.format(max(Sigma_bk.values())))
+
+    return Sigma_bk, Separability
+
+
+def boundary_requirements(C, W, B, BP, T):
+    """
+    Tests the minimum requirements which do not depend on the cutting threshold: normalized weightings, increasing
+        thresholds and separability of the boundary reference actions. Unlike "requirements_test", the results are not
+        memoized, only the credibility indices of "separability_test" are (see "clear_requirements_cache").
+
+    :param C: List containing the names of the criteria as strings.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Performances dictionary of the boundary reference actions.
+    :param T: Dictionary of thresholds.
+
+    :return: Sigma_bk, Separability as returned by "separability_test".
     """
-    # ======================   Test of the minimum requirements to run the ELECTRE Tri method   ====================== #
     # The weights of the criteria must be normalized and their sum must be equal to 1 or 100
     if sum(W.values()) <= 1.000001 and not 0.999999 <= sum(W.values()) <= 1.000001:
         raise NameError('Condition of normalized weights is not respected')
@@ -411,46 +1214,85 @@ def ELECTRE_Tri_B(C, W, A, AP, B, BP, T, CAT, λ, display='NO'):
     for gj in T.keys():
         if not T[gj][0] < T[gj][1] < T[gj][2]:
             raise NameError('Condition of increasing order of thresholds is not respected')
-    # Separability test and verification of the minimum required credibility threshold
-    Sigma_bk, Separability = separability_test(C, W, B, BP, T, display='NO')
-    if λ < max(Sigma_bk.values()):
-        raise NameError('The chosen credibility threshold is lower than the minimum required credibility threshold '
-                        'λ_min = {}'.format(max(Sigma_bk.values())))
+    # Separability test
+    return separability_test(C, W, B, BP, T, display='NO')
+
+
+def ELECTRE_Tri_B(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, λ=None, display='NO', backend=None,
+                  stats=None, output='ALL', precision='FLOAT64'):
+    """
+    Upper function to execute the ELECTRE method by calling each of the elementary functions in the order
+        they should be called. The input data are described below. The data can also be given as a single Problem
+        instance in place of C, in which case CAT and λ must be given as keywords:
+        ELECTRE_Tri_B(PB, CAT=CAT, λ=λ).
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param display: Parameter allowing to choose if the display of the results and comments is desired or not.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param stats: Stats instance, or any function taking the dictionary of the measures of a stage, used to record
+        the wall time, output size and allocated memory of each stage. Nothing is measured if it is None.
+    :param output: "ALL" to build all the indicators, or "RESULTS" to keep only the final assignments, in which case
+        the actions are assigned by "assign_actions" and Conc, Disc, Glob_conc, Cred and Over_rank are LazyIndicators
+        calculating the indicators of a boundary reference action only when they are accessed.
+    :param precision: "FLOAT64", or "FLOAT32" to assign the actions with reduced-precision credibility indices (see
+        "assign_actions"). The "FLOAT32" precision is only available with output="RESULTS", the lazy views of the
+        indicators being calculated in float64.
+
+    :return: Conc, Disc, Glob_conc, Cred, Over_rank, Pessi_sort, Opti_sort, Med_rank, Sigma_bk, Separability
+    """
+    PB = as_problem(C, W, A, AP, B, BP, T)
+    if output != 'ALL' and output != 'RESULTS':
+        raise NameError('The variable "output" must be equal to "ALL" or "RESULTS"')
+    if precision != 'FLOAT64' and (precision != 'FLOAT32' or output != 'RESULTS'):
+        raise NameError('The variable "precision" must be equal to "FLOAT64", or to "FLOAT32" with output="RESULTS"')
+    Stages = get_backend(backend)
+    C, W, A, B, BP, T = PB.C, PB.weights_dict(), PB.A, PB.B, PB.boundaries_dict(), PB.thresholds_dict()
+    if CAT is None or λ is None:
+        raise NameError('The categories "CAT" and the cutting threshold "λ" must be given')
+
+    # ======================   Test of the minimum requirements to run the ELECTRE Tri method   ====================== #
+    Sigma_bk, Separability = traced(stats, 'requirements', requirements_test, C, W, B, BP, T, λ)
 
     # ==========================   Calculation of the indicators of the ELECTRE Tri method   ========================= #
-    # Calculation of the concordance matrices for all the boundary scenarios
-    Conc = {}
-    for b in B:
-        name = '{}'.format(b)
-        Conc[name] = concordance(C, A, AP, b, BP, T)
-    # Calculation of the discordance matrices for all the boundary scenarios
-    Disc = {}
-    for b in B:
-        name = '{}'.format(b)
-        Disc[name] = discordance(C, A, AP, b, BP, T)
-    # Calculation of the global concordances vectors for all the boundary scenarios
-    Glob_conc = {}
-    for b in B:
-        name = '{}'.format(b)
-        Glob_conc[name] = global_concordance(Conc['{}'.format(b)], b, C, W, A)
-    # Calculation of the credibility vectors for all the boundary scenarios
-    Cred = {}
-    for b in B:
-        name = '{}'.format(b)
-        Cred[name] = credibility(Glob_conc['{}'.format(b)], b, Disc['{}'.format(b)], C, A)
-    # Building the matrix of outranking relations
-    Over_rank = {}
-    for b in B:
-        name = '{}'.format(b)
-        Over_rank[name] = over_ranking_relations(Cred['{}'.format(b)], b, λ)
+    if output == 'ALL':
+        # Calculation of the concordance and discordance matrices for all the boundary scenarios in a single pass
+        Conc_ab, Conc_ba, Disc_ab, Disc_ba = traced(stats, 'partial_indices', Stages['partial_indices'], PB.AP,
+                                                    PB.BP, PB.T)
+        # Calculation of the global concordances vectors for all the boundary scenarios
+        Glob_ab, Glob_ba = traced(stats, 'global_concordance', Stages['global_concordance'], Conc_ab, Conc_ba, PB.W)
+        # Calculation of the credibility vectors for all the boundary scenarios
+        Cred_ab, Cred_ba = traced(stats, 'credibility', Stages['credibility'], Glob_ab, Glob_ba, Disc_ab, Disc_ba)
+        # Building the matrix of outranking relations, coded as integers
+        Rel = traced(stats, 'relations', relations_arrays, Cred_ab, Cred_ba, λ)
+        # Legacy dictionary views of the indicators, keyed by the names of the boundary reference actions
+        Conc, Disc, Glob_conc, Cred, Over_rank = traced(stats, 'views', _legacy_views, B, Conc_ab, Conc_ba, Disc_ab,
+                                                        Disc_ba, Glob_ab, Glob_ba, Cred_ab, Cred_ba, Rel)
+        # Ranking of actions in the categories according to the pessimistic and optimistic procedures
+        Pessi_cat, Opti_cat = traced(stats, 'sorting', Stages['sorting'], Cred_ab, Cred_ba, λ, len(CAT))
+    else:
+        # The actions are assigned boundary by boundary, the indicators being recalculated on access for the lazy views
+        Pessi_cat, Opti_cat, _ = traced(stats, 'assignment', _assign, PB, Stages, λ, len(CAT), 'BOTH',
+                                        precision)
+        Conc, Disc, Glob_conc, Cred, Over_rank = _lazy_views(PB, Stages, λ, stats)
 
     # ============================   Ranking of actions and calculation of median ranks   ============================ #
-    # Ranking of actions in the three categories according to the pessimistic procedure and display of the result
-    Pessi_sort = pessimistic_sorting(Over_rank, CAT, A, B)
-    # Ranking of actions in the three categories according to the optimistic procedure and display of the result
-    Opti_sort = optimistic_sorting(Over_rank, CAT, A, B)
+    # The lists of the actions of each category are only built when they are accessed in the "RESULTS" mode
+    lists = 'YES' if output == 'ALL' else 'NO'
+    Pessi_sort = sorting_from_categories(Pessi_cat, CAT, A, lists)
+    Opti_sort = sorting_from_categories(Opti_cat, CAT, A, lists)
     # Calculating the median rank of each action
-    Med_rank = median_rank(Pessi_sort, Opti_sort, A)
+    Unassigned = np.flatnonzero((Opti_cat == 0) | (Pessi_cat == 0))
+    if len(Unassigned) > 0:
+        raise KeyError(A[Unassigned[0]])
+    Med_rank = dict(zip(A, traced(stats, 'median_rank', median_rank_arrays, Pessi_cat, Opti_cat).tolist()))
 
     # ==========================================   Display of the results   ========================================== #
     # Display of the categories in which each action is classified
@@ -475,3 +1317,725 @@ def ELECTRE_Tri_B(C, W, A, AP, B, BP, T, CAT, λ, display='NO'):
         raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
 
     return Conc, Disc, Glob_conc, Cred, Over_rank, Pessi_sort, Opti_sort, Med_rank, Sigma_bk, Separability
+
+
+def _legacy_views(B, Conc_ab, Conc_ba, Disc_ab, Disc_ba, Glob_ab, Glob_ba, Cred_ab, Cred_ba, Rel):
+    """
+    Builds the dictionaries of the indicators returned by "ELECTRE_Tri_B", keyed by the names of the boundary reference
+        actions, in the same format as the reference functions.
+
+    :return: Conc, Disc, Glob_conc, Cred, Over_rank
+    """
+    Conc = {}
+    Disc = {}
+    Glob_conc = {}
+    Cred = {}
+    Over_rank = {}
+    for k, b in enumerate(B):
+        name = '{}'.format(b)
+        Conc[name] = {'c(ai,{})'.format(b): Conc_ab[:, k, :], 'c({},ai)'.format(b): Conc_ba[:, k, :]}
+        Disc[name] = {'d(ai,{})'.format(b): Disc_ab[:, k, :], 'd({},ai)'.format(b): Disc_ba[:, k, :]}
+        Glob_conc[name] = {'C(ai,{})'.format(b): Glob_ab[:, k].tolist(), 'C({},ai)'.format(b): Glob_ba[:, k].tolist()}
+        Cred[name] = {'σ(ai,{})'.format(b): Cred_ab[:, k].tolist(), 'σ({},ai)'.format(b): Cred_ba[:, k].tolist()}
+        Over_rank[name] = RELATIONS[Rel[:, k]].tolist()
+    return Conc, Disc, Glob_conc, Cred, Over_rank
+
+
+class LazyIndicators(collections.abc.Mapping):
+    """
+    Read-only dictionary in which each value is only calculated when it is accessed and is not kept afterwards. It is
+        used for the indicators of the boundary reference actions, e.g. Cred['b2'], and for the lists of the actions
+        of each category returned by "ELECTRE_Tri_B" with output="RESULTS", with the same values as with
+        output="ALL".
+
+    :param Names: List of the keys, e.g. the names of the boundary reference actions.
+    :param function: Function giving the value of a key.
+    """
+
+    def __init__(self, Names, function):
+        self.Names = list(Names)
+        self.function = function
+
+    def __getitem__(self, name):
+        if name not in self.Names:
+            raise KeyError(name)
+        return self.function(name)
+
+    def __iter__(self):
+        return iter(self.Names)
+
+    def __len__(self):
+        return len(self.Names)
+
+    def __repr__(self):
+        return 'LazyIndicators({})'.format(self.Names)
+
+
+def _lazy_views(PB, Stages, λ, stats=None):
+    """
+    Builds the lazy views of the indicators returned by "ELECTRE_Tri_B" with output="RESULTS". The indicators of a
+        boundary reference action are calculated with the same stages as the complete run, on this boundary reference
+        action only, and recorded in stats with the index of the boundary reference action.
+
+    :return: Conc, Disc, Glob_conc, Cred, Over_rank as LazyIndicators.
+    """
+    def views(b):
+        k = PB.B_index[b]
+        Conc_ab, Conc_ba, Disc_ab, Disc_ba = traced(stats, 'partial_indices', Stages['partial_indices'], PB.AP,
+                                                    PB.BP[k:k + 1], PB.T, boundary=k)
+        Glob_ab, Glob_ba = traced(stats, 'global_concordance', Stages['global_concordance'], Conc_ab, Conc_ba, PB.W,
+                                  boundary=k)
+        Cred_ab, Cred_ba = traced(stats, 'credibility', Stages['credibility'], Glob_ab, Glob_ba, Disc_ab, Disc_ba,
+                                  boundary=k)
+        return _legacy_views([b], Conc_ab, Conc_ba, Disc_ab, Disc_ba, Glob_ab, Glob_ba, Cred_ab, Cred_ba,
+                             relations_arrays(Cred_ab, Cred_ba, λ))
+
+    return tuple(LazyIndicators(PB.B, lambda b, i=i: views(b)[i][b]) for i in range(5))
+
+
+def assign_actions(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, λ=None, procedure='BOTH',
+                   backend=None, precision='FLOAT64'):
+    """
+    Assignment engine for the runs which only need the categories. The credibility indices are calculated boundary
+        by boundary, in the order in which the procedures look at the boundary reference actions (from the top for
+        the pessimistic procedure, from the bottom for the optimistic one), and only for the actions which are not yet
+        assigned. The relation of an action with a boundary reference action is calculated at most once and shared by
+        the two procedures. The categories are the same as the ones given by "ELECTRE_Tri_B". As for "ELECTRE_Tri_B",
+        the data can be given as a single Problem instance in place of C.
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param procedure: "BOTH", "PESSIMISTIC" or "OPTIMISTIC". When a single procedure is needed, the boundary
+        reference actions below (pessimistic) or above (optimistic) the category of each action are not evaluated.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param precision: "FLOAT64", or "FLOAT32" to calculate the credibility indices in reduced precision with
+        "relations_float32", the borderline actions being recalculated in float64 so that the categories are the same.
+
+    :return Pessi_cat: Integer array of shape (actions,) containing the pessimistic category of each action, numbered
+        from 1, or 0 if the action could not be assigned or if the procedure was not requested.
+    :return Opti_cat: Integer array of shape (actions,) containing the optimistic category of each action.
+    :return Evaluated: Integer array of shape (actions,) containing the number of boundary reference actions against
+        which each action was evaluated.
+    """
+    PB = as_problem(C, W, A, AP, B, BP, T)
+    if CAT is None or λ is None:
+        raise NameError('The categories "CAT" and the cutting threshold "λ" must be given')
+    if procedure not in ('BOTH', 'PESSIMISTIC', 'OPTIMISTIC'):
+        raise NameError('The variable "procedure" must be equal to "BOTH", "PESSIMISTIC" or "OPTIMISTIC"')
+    if precision != 'FLOAT64' and precision != 'FLOAT32':
+        raise NameError('The variable "precision" must be equal to "FLOAT64" or "FLOAT32"')
+    Stages = get_backend(backend)
+    requirements_test(PB.C, PB.weights_dict(), PB.B, PB.boundaries_dict(), PB.thresholds_dict(), λ)
+    return _assign(PB, Stages, λ, len(CAT), procedure, precision)
+
+
+def _assign(PB, Stages, λ, q, procedure, precision='FLOAT64', stats=None):
+    """
+    Early-exit evaluation of "assign_actions", without the tests of the input data. The stages are recorded in stats
+        with the index of the boundary reference action they are run for.
+
+    :return: Pessi_cat, Opti_cat, Evaluated
+    """
+    n = len(PB.A)
+    # Codes of the outranking relations, -1 for the pairs which have not been evaluated
+    Rel = np.full((n, q + 1), -1, dtype=np.int8)
+
+    def relations(rows, k):
+        todo = rows[Rel[rows, k] < 0]
+        if len(todo) > 0 and precision == 'FLOAT32':
+            Rel[todo, k] = traced(stats, 'relations_float32', relations_float32, PB.AP[todo], PB.BP[k:k + 1], PB.T,
+                                  PB.W, λ, Stages, boundary=k)[0][:, 0]
+        elif len(todo) > 0:
+            Cred_ab, Cred_ba = credibility_indices(PB.AP[todo], PB.BP[k:k + 1], PB.T, PB.W, Stages, stats, k)
+            Rel[todo, k] = relations_arrays(Cred_ab[:, 0], Cred_ba[:, 0], λ)
+        return Rel[rows, k]
+
+    Pessi_cat = np.zeros(n, dtype=int)
+    Opti_cat = np.zeros(n, dtype=int)
+    if procedure != 'OPTIMISTIC':
+        # Pessimistic: first category from the top such that ai > bk or ai I bk+1
+        rows = np.arange(n)
+        upper = relations(rows, q)
+        for j in reversed(range(q)):
+            if len(rows) == 0:
+                break
+            lower = relations(rows, j)
+            done = (lower == 1) | (upper == 3)
+            Pessi_cat[rows[done]] = j + 1
+            rows, upper = rows[~done], lower[~done]
+    if procedure != 'PESSIMISTIC':
+        # Optimistic: first category from the bottom such that ai < bk+1 or ai R bk
+        rows = np.arange(n)
+        lower = relations(rows, 0)
+        for j in range(q):
+            if len(rows) == 0:
+                break
+            upper = relations(rows, j + 1)
+            done = (upper == 2) | (lower == 0)
+            Opti_cat[rows[done]] = j + 1
+            rows, lower = rows[~done], upper[~done]
+    return Pessi_cat, Opti_cat, (Rel >= 0).sum(axis=1)
+
+
+def relations_arrays(CRED_AB, CRED_BA, λ):
+    """
+    Builds the outranking relations of all the actions with regard to all the boundary reference actions as a compact
+        array of integers, coded as 1 * (σ(ai,bk) >= λ) + 2 * (σ(bk,ai) >= λ). The character of each code, as given by
+        "over_ranking_relations", is RELATIONS[code]: 0 for 'R', 1 for '>', 2 for '<' and 3 for 'I'.
+
+    :param CRED_AB: Array of shape (..., boundaries) containing the credibility indices σ(ai,bk).
+    :param CRED_BA: Array of shape (..., boundaries) containing the credibility indices σ(bk,ai).
+    :param λ: Cutting threshold value, or array which can be broadcast against the credibility indices.
+
+    :return Rel: Array of int8 of shape (..., boundaries) containing the codes of the outranking relations.
+    """
+    return ((CRED_AB >= λ).astype(np.int8) | ((CRED_BA >= λ).astype(np.int8) << 1)).astype(np.int8, copy=False)
+
+
+def relations_float32(G_A, G_B, T, W, λ, Stages=None, stats=None, boundary=None):
+    """
+    Reduced-precision version of the calculation of the codes of the outranking relations. The partial indices, the
+        global concordance and the credibility indices are calculated in float32, together with a bound of their
+        rounding error with regard to the float64 calculation. As σ = C * Π min(1, (1 - dj) / (1 - C)) increases with
+        the global concordance C and decreases with each discordance index dj, the bounds of C and dj give a lower and
+        an upper bound of each credibility index. A relation is only decided in float32 when the whole interval lies
+        on the same side of λ: the actions having at least one borderline credibility index are recalculated in
+        float64 with the given stages, so that the codes are identical to the ones given by "relations_arrays".
+
+    :param G_A: Array of shape (actions, criteria) containing the actions performances.
+    :param G_B: Array of shape (boundaries, criteria) containing the boundary reference actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds.
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+    :param λ: Cutting threshold value.
+    :param Stages: Dictionary of the stages used to recalculate the borderline actions (see "get_backend"), the
+        default backend if None.
+    :param stats: Stats instance or function recording the measures of the recalculation (see "ELECTRE_Tri_B").
+    :param boundary: Index of the boundary reference action when G_B contains a single one, recorded in stats.
+
+    :return Rel: Array of int8 of shape (actions, boundaries) containing the codes of the outranking relations.
+    :return Borderline: Boolean array of shape (actions,) stating which actions were recalculated in float64.
+    """
+    if Stages is None:
+        Stages = get_backend()
+    u = np.finfo(np.float32).eps / 2
+    m = G_A.shape[1]
+    # Bounds of the rounding errors of the partial indices of each criterion, which come from the cancellation of the
+    # performances and thresholds in the numerators and denominators
+    Scale = np.abs(G_A).max(axis=0, initial=0) + np.abs(G_B).max(axis=0, initial=0) + np.abs(T).sum(axis=1)
+    E_c = 8 * u * Scale / (T[:, 1] - T[:, 0]) + 6 * u
+    E_d = 8 * u * Scale / (T[:, 2] - T[:, 1]) + 6 * u
+    W_norm = W / sum(W.tolist())
+    E_C = float(W_norm @ E_c) + 4 * (m + 2) * u
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = partial_indices_arrays(G_A.astype(np.float32), G_B.astype(np.float32),
+                                                                T.astype(np.float32))
+    W_32 = W_norm.astype(np.float32)
+    Glob_ab = np.zeros(Conc_ab.shape[:-1], dtype=np.float32)
+    Glob_ba = np.zeros(Conc_ba.shape[:-1], dtype=np.float32)
+    for j in range(m):
+        Glob_ab += W_32[j] * Conc_ab[..., j]
+        Glob_ba += W_32[j] * Conc_ba[..., j]
+    del Conc_ab, Conc_ba
+
+    def bounds(GLOB, DISC):
+        C_lo = np.maximum(GLOB - np.float32(E_C), 0)
+        C_hi = GLOB + np.float32(E_C)
+        cr_lo = np.ones(GLOB.shape, dtype=np.float32)
+        cr_hi = np.ones(GLOB.shape, dtype=np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for j in range(m):
+                d_lo = np.maximum(DISC[..., j] - np.float32(E_d[j]), 0)
+                d_hi = np.minimum(DISC[..., j] + np.float32(E_d[j]), 1)
+                cr_lo *= np.where(C_lo < 1, np.minimum((1 - d_hi) / (1 - C_lo), 1), 1)
+                cr_hi *= np.where(C_hi < 1, np.minimum((1 - d_lo) / (1 - C_hi), 1), 1)
+        # Rounding of the products, the bounds being compared with λ in float64
+        r = 8 * (m + 2) * u
+        return (cr_lo * C_lo).astype(np.float64) * (1 - r), (cr_hi * C_hi).astype(np.float64) * (1 + r)
+
+    Lo_ab, Hi_ab = bounds(Glob_ab, Disc_ab)
+    Lo_ba, Hi_ba = bounds(Glob_ba, Disc_ba)
+    del Glob_ab, Glob_ba, Disc_ab, Disc_ba
+    Rel = relations_arrays(Lo_ab, Lo_ba, λ)
+    Borderline = (((Lo_ab < λ) & (Hi_ab >= λ)) | ((Lo_ba < λ) & (Hi_ba >= λ))).any(axis=-1)
+    rows = np.flatnonzero(Borderline)
+    if len(rows) > 0:
+        Cred_ab, Cred_ba = credibility_indices(G_A[rows], G_B, T, W, Stages, stats, boundary)
+        Rel[rows] = relations_arrays(Cred_ab, Cred_ba, λ)
+    return Rel, Borderline
+
+
+def sorting_arrays(REL, q):
+    """
+    Applies the pessimistic and optimistic procedures of "pessimistic_sorting" and "optimistic_sorting" to an array
+        of coded outranking relations, along its last axis, the first qualifying boundary reference action being
+        found with "argmax".
+
+    :param REL: Array of shape (..., boundaries) containing the codes of the outranking relations, as returned by
+        "relations_arrays".
+    :param q: Number of categories.
+
+    :return Pessi_cat: Integer array of shape (...) containing the pessimistic category of each action, numbered from 1,
+        or 0 if the action could not be assigned.
+    :return Opti_cat: Integer array of shape (...) containing the optimistic category of each action, numbered from 1,
+        or 0 if the action could not be assigned.
+    """
+    REL = REL[..., :q + 1]
+    # Pessimistic: first category from the top such that ai > bk or ai I bk+1
+    pessi = (REL[..., :-1] == 1) | (REL[..., 1:] == 3)
+    Pessi_cat = np.where(pessi.any(axis=-1), q - np.argmax(pessi[..., ::-1], axis=-1), 0)
+    # Optimistic: first category from the bottom such that ai < bk+1 or ai R bk
+    opti = (REL[..., 1:] == 2) | (REL[..., :-1] == 0)
+    Opti_cat = np.where(opti.any(axis=-1), np.argmax(opti, axis=-1) + 1, 0)
+    return Pessi_cat, Opti_cat
+
+
+def median_rank_arrays(PESSI_CAT, OPTI_CAT):
+    """
+    Calculates the median rank of each action from the arrays of categories returned by "sorting_arrays".
+
+    :param PESSI_CAT: Integer array containing the pessimistic category of each action.
+    :param OPTI_CAT: Integer array containing the optimistic category of each action.
+
+    :return: Array containing the median rank of each action, meaningful only for the actions assigned by both
+        procedures.
+    """
+    return (OPTI_CAT + PESSI_CAT) / 2
+
+
+def sorting_from_categories(CATEGORY, CAT, A, lists='YES'):
+    """
+    Builds the sorting in the same format as "pessimistic_sorting" and "optimistic_sorting" from an array of
+        categories numbered from 1.
+
+    :param CATEGORY: Integer array of shape (actions,) containing the category of each action, numbered from 1, or 0 if
+        the action could not be assigned.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param A: List containing the names of the actions as strings.
+    :param lists: "YES" to build the lists of the actions of each category, or "NO" to give them as LazyIndicators
+        building the list of a category only when it is accessed.
+
+    :return: sorting: Dictionary containing the different categories and the actions they contain.
+    :return: category: Dictionary containing the category of each action, numbered from 1.
+    """
+    if lists == 'NO':
+        CATEGORY = np.array(CATEGORY)
+        sorting = LazyIndicators(CAT, lambda cat: [A[i] for i in np.flatnonzero(CATEGORY == CAT.index(cat) + 1)])
+        return sorting, {a: j for a, j in zip(A, CATEGORY.tolist()) if j > 0}
+    sorting = {}
+    category = {}
+    for cat in CAT:
+        sorting[cat] = []
+    for a, j in zip(A, CATEGORY.tolist()):
+        if j > 0:
+            sorting[CAT[j - 1]].append(a)
+            category[a] = j
+    return sorting, category
+
+
+def lambda_sweep(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, Λ=None, backend=None, stats=None):
+    """
+    Classifies the actions for many cutting thresholds from a single calculation of the credibility indices, since
+        only the outranking relations depend on λ. The exact values of λ at which at least one action changes of
+        category are also given: the assignments are constant on each interval ]λ_i, λ_i+1] between two successive
+        breakpoints. As for "ELECTRE_Tri_B", the data can be given as a single Problem instance in place of C.
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param Λ: List of the cutting threshold values.
+    :param backend: Name of the compute backend used to calculate the credibility indices (see "get_backend").
+    :param stats: Stats instance or function recording the measures of each stage, as for "ELECTRE_Tri_B".
+
+    :return Pessi_cat: Array of shape (thresholds, actions) containing the pessimistic category of each action,
+        numbered from 1 as in "pessimistic_sorting", for each cutting threshold.
+    :return Opti_cat: Array of shape (thresholds, actions) containing the optimistic category of each action.
+    :return Med_rank: Array of shape (thresholds, actions) containing the median rank of each action.
+    :return Breakpoints: Sorted array of the values of λ at which at least one action changes of category.
+    """
+    PB = as_problem(C, W, A, AP, B, BP, T)
+    Stages = get_backend(backend)
+    C, W, B, BP, T = PB.C, PB.weights_dict(), PB.B, PB.boundaries_dict(), PB.thresholds_dict()
+    if CAT is None or Λ is None:
+        raise NameError('The categories "CAT" and the cutting thresholds "Λ" must be given')
+    Λ = np.asarray(Λ, dtype=np.float64).reshape(-1)
+    if len(Λ) > 0:
+        traced(stats, 'requirements', requirements_test, C, W, B, BP, T, Λ.min())
+    q = len(CAT)
+
+    # The credibility indices are calculated only once for all the cutting thresholds
+    Cred_ab, Cred_ba = credibility_indices(PB.AP, PB.BP, PB.T, PB.W, Stages, stats)
+
+    Pessi_cat = np.empty((len(Λ), len(PB.A)), dtype=int)
+    Opti_cat = np.empty((len(Λ), len(PB.A)), dtype=int)
+    for i, λ in enumerate(Λ):
+        Pessi_cat[i], Opti_cat[i] = traced(stats, 'sorting', Stages['sorting'], Cred_ab, Cred_ba, λ, q)
+    Med_rank = median_rank_arrays(Pessi_cat, Opti_cat)
+
+    # The relations of an action only change when λ crosses one of its credibility values. The categories are
+    # evaluated once on each interval, at its upper bound, and compared with the interval just below.
+    Values = np.sort(np.concatenate((Cred_ab[:, :q + 1], Cred_ba[:, :q + 1]), axis=1), axis=1)
+    Upper = np.concatenate((Values, np.full((len(PB.A), 1), np.inf)), axis=1)
+    Rel = relations_arrays(Cred_ab[:, np.newaxis, :q + 1], Cred_ba[:, np.newaxis, :q + 1], Upper[:, :, np.newaxis])
+    Pessi_int, Opti_int = sorting_arrays(Rel, q)
+    change = (Pessi_int[:, 1:] != Pessi_int[:, :-1]) | (Opti_int[:, 1:] != Opti_int[:, :-1])
+    Breakpoints = np.unique(Values[change])
+
+    return Pessi_cat, Opti_cat, Med_rank, Breakpoints
+
+
+# ================================================   Compute backends   ============================================= #
+# Each backend gives the same four stages working on the arrays of a Problem instance:
+#   - 'partial_indices'(G_A, G_B, T) -> Conc_ab, Conc_ba, Disc_ab, Disc_ba
+#   - 'global_concordance'(CONC_AB, CONC_BA, W) -> Glob_ab, Glob_ba
+#   - 'credibility'(GLOB_AB, GLOB_BA, DISC_AB, DISC_BA) -> Cred_ab, Cred_ba
+#   - 'sorting'(CRED_AB, CRED_BA, λ, q) -> Pessi_cat, Opti_cat
+# and all of them give the same results as the reference functions of this module.
+
+# Name of the environment variable used to choose the backend when it is not given as argument
+BACKEND_VARIABLE = 'ELECTRE_TRI_B_BACKEND'
+DEFAULT_BACKEND = 'NUMPY'
+_BACKENDS = {}
+
+
+def _reference_names(n, k, m):
+    """
+    :param n: Number of actions.
+    :param k: Number of boundary reference actions.
+    :param m: Number of criteria.
+
+    :return: C, A, B lists of the names given to the criteria, actions and boundary reference actions to call the
+        reference functions on arrays.
+    """
+    return ['g{}'.format(j) for j in range(m)], ['a{}'.format(i) for i in range(n)], ['b{}'.format(b) for b in range(k)]
+
+
+def _reference_partial_indices(G_A, G_B, T, stats=None, boundary=None):
+    """
+    Reference backend: calls "concordance" and "discordance" for each boundary reference action. The reference
+        backends call the stage functions without their memoization, so that they are always calculated. The calls
+        of each boundary reference action are recorded in stats, boundary being the index of the first boundary
+        reference action of G_B.
+    """
+    C, A, B = _reference_names(G_A.shape[0], G_B.shape[0], G_A.shape[1])
+    AP = {a: dict(zip(C, row)) for a, row in zip(A, G_A.tolist())}
+    BP = {b: dict(zip(C, row)) for b, row in zip(B, G_B.tolist())}
+    T_dict = {c: tuple(row) for c, row in zip(C, T.tolist())}
+    shape = (len(A), len(B), len(C))
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = np.empty(shape), np.empty(shape), np.empty(shape), np.empty(shape)
+    for k, b in enumerate(B):
+        index = k + (boundary or 0)
+        conc = traced(stats, 'reference_concordance', concordance.__wrapped__, C, A, AP, b, BP, T_dict,
+                      boundary=index)
+        disc = traced(stats, 'reference_discordance', discordance.__wrapped__, C, A, AP, b, BP, T_dict,
+                      boundary=index)
+        Conc_ab[:, k, :] = conc['c(ai,{})'.format(b)].reshape(len(A), len(C))
+        Conc_ba[:, k, :] = conc['c({},ai)'.format(b)].reshape(len(A), len(C))
+        Disc_ab[:, k, :] = disc['d(ai,{})'.format(b)].reshape(len(A), len(C))
+        Disc_ba[:, k, :] = disc['d({},ai)'.format(b)].reshape(len(A), len(C))
+    return Conc_ab, Conc_ba, Disc_ab, Disc_ba
+
+
+def _reference_global_concordance(CONC_AB, CONC_BA, W, stats=None, boundary=None):
+    """
+    Reference backend: calls "global_concordance" for each boundary reference action, recorded in stats.
+    """
+    C, A, B = _reference_names(*CONC_AB.shape)
+    W_dict = dict(zip(C, W.tolist()))
+    Glob_ab, Glob_ba = np.empty(CONC_AB.shape[:-1]), np.empty(CONC_BA.shape[:-1])
+    for k, b in enumerate(B):
+        CONC = {'c(ai,{})'.format(b): CONC_AB[:, k, :], 'c({},ai)'.format(b): CONC_BA[:, k, :]}
+        glob_conc = traced(stats, 'reference_global_concordance', global_concordance.__wrapped__, CONC, b, C, W_dict,
+                           A, boundary=k + (boundary or 0))
+        Glob_ab[:, k] = glob_conc['C(ai,{})'.format(b)]
+        Glob_ba[:, k] = glob_conc['C({},ai)'.format(b)]
+    return Glob_ab, Glob_ba
+
+
+def _reference_credibility(GLOB_AB, GLOB_BA, DISC_AB, DISC_BA, stats=None, boundary=None):
+    """
+    Reference backend: calls "credibility" for each boundary reference action, recorded in stats.
+    """
+    C, A, B = _reference_names(*DISC_AB.shape)
+    Cred_ab, Cred_ba = np.empty(GLOB_AB.shape), np.empty(GLOB_BA.shape)
+    for k, b in enumerate(B):
+        GLOB_CONC = {'C(ai,{})'.format(b): GLOB_AB[:, k].tolist(), 'C({},ai)'.format(b): GLOB_BA[:, k].tolist()}
+        DISC = {'d(ai,{})'.format(b): DISC_AB[:, k, :], 'd({},ai)'.format(b): DISC_BA[:, k, :]}
+        cred = traced(stats, 'reference_credibility', credibility.__wrapped__, GLOB_CONC, b, DISC, C, A,
+                      boundary=k + (boundary or 0))
+        Cred_ab[:, k] = cred['σ(ai,{})'.format(b)]
+        Cred_ba[:, k] = cred['σ({},ai)'.format(b)]
+    return Cred_ab, Cred_ba
+
+
+def _reference_sorting(CRED_AB, CRED_BA, λ, q, stats=None):
+    """
+    Reference backend: calls "over_ranking_relations", for each boundary reference action, recorded in stats, then
+        "pessimistic_sorting" and "optimistic_sorting".
+    """
+    _, A, B = _reference_names(CRED_AB.shape[0], CRED_AB.shape[1], 0)
+    CAT = ['C{}'.format(j + 1) for j in range(q)]
+    Over_rank = {}
+    for k, b in enumerate(B):
+        CRED = {'σ(ai,{})'.format(b): CRED_AB[:, k].tolist(), 'σ({},ai)'.format(b): CRED_BA[:, k].tolist()}
+        Over_rank[b] = traced(stats, 'reference_relations', over_ranking_relations, CRED, b, λ, boundary=k)
+    pessi = pessimistic_sorting(Over_rank, CAT, A, B)[1]
+    opti = optimistic_sorting(Over_rank, CAT, A, B)[1]
+    Pessi_cat = np.array([pessi.get(a, 0) for a in A], dtype=int)
+    Opti_cat = np.array([opti.get(a, 0) for a in A], dtype=int)
+    return Pessi_cat, Opti_cat
+
+
+def _numpy_sorting(CRED_AB, CRED_BA, λ, q):
+    """
+    NumPy backend: vectorized pessimistic and optimistic procedures on the coded outranking relations.
+    """
+    return sorting_arrays(relations_arrays(CRED_AB, CRED_BA, λ), q)
+
+
+def _numba_backend():
+    """
+    Compiles the stages of the Numba backend. The loops follow the order of the operations of the reference functions
+        so that the values are identical.
+
+    :return: Dictionary of the stages of the backend.
+    """
+    import numba
+
+    @numba.njit(cache=True)
+    def partial_indices_kernel(G_A, G_B, T):
+        n, m = G_A.shape
+        k = G_B.shape[0]
+        Conc_ab = np.empty((n, k, m))
+        Conc_ba = np.empty((n, k, m))
+        Disc_ab = np.empty((n, k, m))
+        Disc_ba = np.empty((n, k, m))
+        for i in range(n):
+            for b in range(k):
+                for j in range(m):
+                    q, p, v = T[j, 0], T[j, 1], T[j, 2]
+                    a_j, b_j = G_A[i, j], G_B[b, j]
+                    Conc_ab[i, b, j] = min(1.0, max(0.0, (a_j - b_j + p) / (p - q)))
+                    Conc_ba[i, b, j] = min(1.0, max(0.0, (b_j - a_j + p) / (p - q)))
+                    Disc_ab[i, b, j] = min(1.0, max(0.0, (b_j - a_j - p) / (v - p)))
+                    Disc_ba[i, b, j] = min(1.0, max(0.0, (a_j - b_j - p) / (v - p)))
+        return Conc_ab, Conc_ba, Disc_ab, Disc_ba
+
+    @numba.njit(cache=True)
+    def global_concordance_kernel(CONC, W, sum_W):
+        n, k, m = CONC.shape
+        Glob = np.empty((n, k))
+        for i in range(n):
+            for b in range(k):
+                g = 0.0
+                for j in range(m):
+                    g = g + (W[j] * CONC[i, b, j]) / sum_W
+                Glob[i, b] = g
+        return Glob
+
+    @numba.njit(cache=True)
+    def credibility_kernel(GLOB, DISC):
+        n, k, m = DISC.shape
+        Cred = np.empty((n, k))
+        for i in range(n):
+            for b in range(k):
+                cr = 1.0
+                for j in range(m):
+                    if DISC[i, b, j] > GLOB[i, b]:
+                        cr = cr * (1 - DISC[i, b, j]) / (1 - GLOB[i, b])
+                Cred[i, b] = cr * GLOB[i, b]
+        return Cred
+
+    @numba.njit(cache=True)
+    def sorting_kernel(CRED_AB, CRED_BA, λ, q):
+        n = CRED_AB.shape[0]
+        Pessi_cat = np.zeros(n, dtype=np.int64)
+        Opti_cat = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            # Pessimistic: first category from the top such that ai > bk or ai I bk+1
+            for j in range(q - 1, -1, -1):
+                if (CRED_AB[i, j] >= λ > CRED_BA[i, j]) or (CRED_AB[i, j + 1] >= λ and CRED_BA[i, j + 1] >= λ):
+                    Pessi_cat[i] = j + 1
+                    break
+            # Optimistic: first category from the bottom such that ai < bk+1 or ai R bk
+            for j in range(q):
+                if (CRED_AB[i, j + 1] < λ <= CRED_BA[i, j + 1]) or (CRED_AB[i, j] < λ and CRED_BA[i, j] < λ):
+                    Opti_cat[i] = j + 1
+                    break
+        return Pessi_cat, Opti_cat
+
+    def partial_indices_stage(G_A, G_B, T):
+        return partial_indices_kernel(np.ascontiguousarray(G_A), np.ascontiguousarray(G_B), np.ascontiguousarray(T))
+
+    def global_concordance_stage(CONC_AB, CONC_BA, W):
+        sum_W = sum(W.tolist())
+        W = np.ascontiguousarray(W, dtype=np.float64)
+        return (global_concordance_kernel(np.ascontiguousarray(CONC_AB), W, sum_W),
+                global_concordance_kernel(np.ascontiguousarray(CONC_BA), W, sum_W))
+
+    def credibility_stage(GLOB_AB, GLOB_BA, DISC_AB, DISC_BA):
+        return (credibility_kernel(np.ascontiguousarray(GLOB_AB), np.ascontiguousarray(DISC_AB)),
+                credibility_kernel(np.ascontiguousarray(GLOB_BA), np.ascontiguousarray(DISC_BA)))
+
+    def sorting_stage(CRED_AB, CRED_BA, λ, q):
+        return sorting_kernel(np.ascontiguousarray(CRED_AB), np.ascontiguousarray(CRED_BA), float(λ), q)
+
+    return {'partial_indices': partial_indices_stage,
+            'global_concordance': global_concordance_stage,
+            'credibility': credibility_stage,
+            'sorting': sorting_stage}
+
+
+def available_backends():
+    """
+    :return: List of the names of the compute backends which can be used on this machine.
+    """
+    names = ['REFERENCE', 'NUMPY']
+    try:
+        import numba  # noqa: F401
+        names.append('NUMBA')
+    except ImportError:
+        pass
+    return names
+
+
+def get_backend(backend=None):
+    """
+    Gives the stages of a compute backend. The backend is chosen by its name, or by the environment variable
+        ELECTRE_TRI_B_BACKEND when no name is given, and is "NUMPY" by default:
+            - "REFERENCE": the pure Python reference functions of this module, kept for auditing,
+            - "NUMPY": the vectorized functions working on arrays,
+            - "NUMBA": compiled loops, available only if Numba is installed.
+
+    :param backend: Name of the backend, or None.
+
+    :return: Dictionary of the stages of the backend, with the keys 'partial_indices', 'global_concordance',
+        'credibility' and 'sorting', and for the "NUMPY" backend the keys 'sparse_partial_indices' and
+        'sparse_credibility' of the sparse vetoes used by "credibility_indices".
+    """
+    if backend is None:
+        backend = os.environ.get(BACKEND_VARIABLE, DEFAULT_BACKEND)
+    backend = backend.upper()
+    if backend not in _BACKENDS:
+        if backend == 'REFERENCE':
+            _BACKENDS[backend] = {'partial_indices': _reference_partial_indices,
+                                  'global_concordance': _reference_global_concordance,
+                                  'credibility': _reference_credibility,
+                                  'sorting': _reference_sorting}
+        elif backend == 'NUMPY':
+            _BACKENDS[backend] = {'partial_indices': partial_indices_arrays,
+                                  'global_concordance': global_concordance_arrays,
+                                  'credibility': credibility_arrays,
+                                  'sorting': _numpy_sorting,
+                                  'sparse_partial_indices': partial_indices_sparse,
+                                  'sparse_credibility': credibility_sparse}
+        elif backend == 'NUMBA':
+            if 'NUMBA' not in available_backends():
+                raise NameError('The "NUMBA" backend requires the numba package to be installed')
+            _BACKENDS[backend] = _numba_backend()
+        else:
+            raise NameError('The backend must be equal to "REFERENCE", "NUMPY" or "NUMBA"')
+    return _BACKENDS[backend]
+
+
+# ================================================   Instrumentation   ============================================== #
+class Stats:
+    """
+    Statistics of the stages of the ELECTRE Tri-B method, recorded when given as "stats" argument to "ELECTRE_Tri_B",
+        "lambda_sweep" or "ELECTRE_Tri_B_stream". Each call of a stage adds a record containing:
+            - 'Stage': name of the stage,
+            - 'Boundary': index of the boundary reference action, 0 for the lowest one, for the stages run boundary by
+                boundary, else None,
+            - 'Time': wall time in seconds,
+            - 'Shape': list of the shapes of the arrays returned by the stage,
+            - 'Size': size in bytes of the arrays returned by the stage,
+            - 'Memory': peak memory in bytes allocated during the stage, only measured if tracemalloc is tracing,
+                else None.
+        The stages run inside another stage, such as the boundary by boundary stages of the "RESULTS" output or of the
+        "REFERENCE" backend, are recorded as well, their time being included in the one of the enclosing stage. Any
+        other function taking such a record as argument can be given in place of a Stats instance to send the
+        records to another tracer.
+    """
+
+    def __init__(self):
+        self.Records = []
+
+    def __call__(self, record):
+        self.Records.append(record)
+
+    def summary(self):
+        """
+        :return Summary: Dictionary containing for each stage, in the order of their first call, a dictionary with the
+            number of calls 'Calls', the total wall time 'Time', the total size of the returned arrays 'Size' and the
+            largest peak memory 'Memory'.
+        """
+        Summary = {}
+        for record in self.Records:
+            stage = Summary.setdefault(record['Stage'], {'Calls': 0, 'Time': 0.0, 'Size': 0, 'Memory': None})
+            stage['Calls'] += 1
+            stage['Time'] += record['Time']
+            stage['Size'] += record['Size']
+            if record['Memory'] is not None:
+                stage['Memory'] = max(stage['Memory'] or 0, record['Memory'])
+        return Summary
+
+    def display(self):
+        """
+        Displays the summary of the statistics, one line for each stage.
+        """
+        for name, stage in self.summary().items():
+            print('{:<24} calls : {:>6}   time : {:10.6f} s   size : {:10.3f} MB   memory : {}'.format(
+                name, stage['Calls'], stage['Time'], stage['Size'] / 2 ** 20,
+                'n/a' if stage['Memory'] is None else '{:.3f} MB'.format(stage['Memory'] / 2 ** 20)))
+
+
+# Peak memory of the stages, for the stages which run other stages (see "traced")
+_TRACED_PEAK = threading.local()
+
+
+def traced(stats, stage, function, *args, boundary=None):
+    """
+    Calls a stage of the method and, if stats is not None, sends its measures to stats. When stats is None, the
+        function is called directly and nothing is measured. The functions having "stats" or "boundary" arguments
+        receive them, so that the stages they run themselves are recorded too.
+
+    :param stats: Stats instance, function taking the record of the measures, or None.
+    :param stage: Name of the stage.
+    :param function: Function of the stage.
+    :param args: Arguments of the function.
+    :param boundary: Index of the boundary reference action for the stages run boundary by boundary.
+
+    :return: Result of the function.
+    """
+    if stats is None:
+        return function(*args)
+    Parameters = inspect.signature(function).parameters
+    kwargs = {name: value for name, value in (('stats', stats), ('boundary', boundary)) if name in Parameters}
+    memory = tracemalloc.is_tracing()
+    if memory:
+        # The peaks of the stages run inside this one are kept, as they reset the peak of tracemalloc
+        outer_peak = getattr(_TRACED_PEAK, 'value', 0)
+        _TRACED_PEAK.value = 0
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    if memory:
+        peak = max(tracemalloc.get_traced_memory()[1], _TRACED_PEAK.value)
+        _TRACED_PEAK.value = max(outer_peak, peak)
+    arrays = [x for x in (result if isinstance(result, tuple) else (result,)) if isinstance(x, np.ndarray)]
+    stats({'Stage': stage, 'Boundary': boundary, 'Time': elapsed, 'Shape': [x.shape for x in arrays],
+           'Size': sum(x.nbytes for x in arrays),
+           'Memory': peak - start_memory if memory else None})
+    return result
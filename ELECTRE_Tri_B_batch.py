@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 17:45
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import ELECTRE_Tri_B_stream
+import numpy as np
+import argparse
+import concurrent.futures
+import csv
+import os
+import sys
+from multiprocessing import shared_memory
+
+
+def read_manifest(name_manifest):
+    """
+    Reads the manifest of a batch of problems. The manifest is a .csv file which must contain on the first line the
+        names of the columns "Problem", "Weights", "Actions", "Boundaries" and "Thresholds", and on each following line
+        the name of a problem and the names of its four .csv files, as given to "input_data". The relative names of
+        the files are taken from the directory of the manifest.
+
+    :param name_manifest: Name of the .csv file of the manifest.
+
+    :return Manifest: List of tuples (name, name_W, name_AP, name_BP, name_T), one for each problem.
+    """
+    columns = ['Problem', 'Weights', 'Actions', 'Boundaries', 'Thresholds']
+    folder = os.path.dirname(os.path.abspath(name_manifest))
+    Manifest = []
+    with open(name_manifest, 'r', newline='') as manifest_csv:
+        reader = csv.reader(manifest_csv, delimiter=',')
+        header = [name.strip() for name in next(reader, [])]
+        if header != columns:
+            raise NameError('The first line of the manifest must be "{}"'.format(','.join(columns)))
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(columns):
+                raise NameError('Each line of the manifest must contain {} values'.format(len(columns)))
+            row = [value.strip() for value in row]
+            Manifest.append(tuple([row[0]] + [os.path.join(folder, name) for name in row[1:]]))
+    names = [problem[0] for problem in Manifest]
+    if len(set(names)) != len(names):
+        raise NameError('The names of the problems of the manifest must be unique')
+    return Manifest
+
+
+def _share(array):
+    """
+    Copies an array in a new block of shared memory.
+
+    :param array: Array of float64.
+
+    :return shm: SharedMemory instance, which must be kept open by the caller and unlinked at the end.
+    :return descriptor: Tuple (name, shape) allowing other processes to find the array.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape)
+
+
+def _attach(descriptor, blocks):
+    """
+    :param descriptor: Tuple (name, shape) returned by "_share".
+    :param blocks: List in which the SharedMemory instance is kept as long as the array is used.
+
+    :return: Array of float64 using the shared memory, without copy.
+    """
+    name, shape = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    blocks.append(shm)
+    return np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+_worker_models = None
+_worker_blocks = []
+
+
+def _init_worker(models, CAT, λ, backend):
+    """
+    Rebuilds in each process of the pool the boundary models from the shared memory, so that the weightings,
+        boundary reference actions and thresholds are neither copied nor pickled for each problem.
+
+    :param models: Dictionary giving for each boundary model the tuple (C, B, W, BP, T) where W, BP and T are the
+        descriptors of the arrays in shared memory.
+    """
+    global _worker_models
+    _worker_models = {}
+    for key, (C, B, W, BP, T) in models.items():
+        W, BP, T = _attach(W, _worker_blocks), _attach(BP, _worker_blocks), _attach(T, _worker_blocks)
+        _worker_models[key] = (ELECTRE_Tri_B.Problem(C, W, [], np.empty((0, len(C))), B, BP, T), CAT, λ, backend)
+
+
+def _classify_problem(task):
+    """
+    Classifies the actions of one problem against its boundary model. Any error is returned instead of raised, so
+        that it does not stop the other problems of the batch.
+
+    :param task: Tuple (name, name_AP, key) giving the name of the problem, the name of its actions .csv file and the
+        key of its boundary model.
+
+    :return: Tuple (name, A, Pessi_cat, Opti_cat, Med_rank, error) where error is None if the problem was classified.
+    """
+    name, name_AP, key = task
+    try:
+        PB, CAT, λ, backend = _worker_models[key]
+        A, AP = ELECTRE_Tri_B.input_actions(name_AP, PB.C)
+        Pessi_sort, Opti_sort, Med_rank = ELECTRE_Tri_B_stream.classify_chunk(PB.with_actions(A, AP), CAT, λ,
+                                                                              backend)
+        return (name, A, [Pessi_sort[1][a] for a in A], [Opti_sort[1][a] for a in A], [Med_rank[a] for a in A],
+                None)
+    except Exception as error:
+        return name, None, None, None, None, '{}: {}'.format(type(error).__name__, error)
+
+
+def ELECTRE_Tri_B_batch(Manifest, CAT, λ, name_out=None, processes=None, backend=None, display='NO'):
+    """
+    Runs the ELECTRE Tri-B method on a batch of independent problems. The problems sharing the same weightings,
+        boundary reference actions and thresholds files share one boundary model, which is imported and tested only
+        once and placed in shared memory for the processes of the pool. An error in one problem is reported without
+        stopping the batch.
+
+    :param Manifest: List of tuples (name, name_W, name_AP, name_BP, name_T) as returned by "read_manifest".
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param name_out: Name of the consolidated output .csv file, or None. Each line contains the name of a problem, the
+        name of an action, its pessimistic category, its optimistic category and its median rank.
+    :param processes: Number of processes used to classify the problems, or None to classify them in this process.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param display: Parameter allowing to choose if the display of the progress and errors is desired or not.
+
+    :return Results: Dictionary containing for each classified problem the tuple (Pessi_sort, Opti_sort, Med_rank)
+        where Pessi_sort and Opti_sort are the dictionaries of the categories of the actions, as in the second
+        element returned by "pessimistic_sorting" and "optimistic_sorting".
+    :return Errors: Dictionary containing for each problem which could not be classified the error message.
+    """
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    ELECTRE_Tri_B.get_backend(backend)
+    Errors = {}
+    Models = {}
+    tasks = []
+    for name, name_W, name_AP, name_BP, name_T in Manifest:
+        key = (name_W, name_BP, name_T)
+        if key not in Models:
+            try:
+                Models[key] = ELECTRE_Tri_B_stream.boundary_model(name_W, name_BP, name_T, λ)[0]
+            except Exception as error:
+                Models[key] = '{}: {}'.format(type(error).__name__, error)
+        if isinstance(Models[key], str):
+            Errors[name] = Models[key]
+        else:
+            tasks.append((name, name_AP, key))
+    Models = {key: PB for key, PB in Models.items() if not isinstance(PB, str)}
+
+    global _worker_models
+    blocks = []
+    try:
+        if processes is None:
+            _worker_models = {key: (PB, CAT, λ, backend) for key, PB in Models.items()}
+            outputs = map(_classify_problem, tasks)
+            pool = None
+        else:
+            models = {}
+            for key, PB in Models.items():
+                arrays = []
+                for array in (PB.W, PB.BP, PB.T):
+                    shm, descriptor = _share(array)
+                    blocks.append(shm)
+                    arrays.append(descriptor)
+                models[key] = (PB.C, PB.B, *arrays)
+            pool = concurrent.futures.ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                                          initargs=(models, CAT, λ, backend))
+            outputs = pool.map(_classify_problem, tasks)
+        Results = {}
+        out_csv = open(name_out, 'w', newline='') if name_out is not None else None
+        try:
+            if out_csv is not None:
+                writer = csv.writer(out_csv, delimiter=',')
+                writer.writerow(['Problem', 'Action', 'Pessimistic category', 'Optimistic category', 'Median rank'])
+            for name, A, Pessi_cat, Opti_cat, Med_rank, error in outputs:
+                if error is not None:
+                    Errors[name] = error
+                    if display == 'YES':
+                        print('Problem {} : {}'.format(name, error))
+                    continue
+                Results[name] = (dict(zip(A, Pessi_cat)), dict(zip(A, Opti_cat)), dict(zip(A, Med_rank)))
+                if out_csv is not None:
+                    writer.writerows([name, a, CAT[p - 1], CAT[o - 1], m]
+                                     for a, p, o, m in zip(A, Pessi_cat, Opti_cat, Med_rank))
+                if display == 'YES':
+                    print('Problem {} : {} actions classified'.format(name, len(A)))
+        finally:
+            if out_csv is not None:
+                out_csv.close()
+            if pool is not None:
+                pool.shutdown()
+    finally:
+        _worker_models = None
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    return Results, Errors
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the batch runner:
+        python ELECTRE_Tri_B_batch.py manifest.csv --categories C1,C2,C3 --lambda 0.6 --output results.csv
+
+    :param argv: List of the arguments, or None to use the arguments of the command line.
+
+    :return: Exit status, 0 if all the problems were classified and 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Runs the ELECTRE Tri-B method on a batch of problems.')
+    parser.add_argument('manifest', help='.csv file listing the problems and their input files')
+    parser.add_argument('--categories', required=True, help='names of the categories, from worst to best, '
+                                                             'separated by commas')
+    parser.add_argument('--lambda', dest='λ', type=float, required=True, help='cutting threshold value')
+    parser.add_argument('--output', required=True, help='consolidated output .csv file')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help='number of processes')
+    parser.add_argument('--backend', default=None, help='compute backend, "REFERENCE", "NUMPY" or "NUMBA"')
+    args = parser.parse_args(argv)
+    CAT = [cat.strip() for cat in args.categories.split(',')]
+    Manifest = read_manifest(args.manifest)
+    Results, Errors = ELECTRE_Tri_B_batch(Manifest, CAT, args.λ, args.output, args.processes, args.backend)
+    print('{} problems classified, {} errors'.format(len(Results), len(Errors)))
+    for name, error in Errors.items():
+        print('Problem {} : {}'.format(name, error), file=sys.stderr)
+    return 1 if Errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
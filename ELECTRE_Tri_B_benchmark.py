@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 19:05
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import numpy as np
+import argparse
+import csv
+import sys
+import time
+import tracemalloc
+
+# Stages of the pipeline timed separately, in the order they are run
+STAGES = ['requirements', 'partial_indices', 'global_concordance', 'credibility', 'sorting', 'median_rank']
+# Other paths of the engine checked against the reference functions, without being timed
+PATHS = ['credibility_indices', 'lookup_partial_indices', 'lookup_credibility_indices', 'assignment',
+         'float32_assignment']
+
+
+def generate_problem(n_actions, n_criteria=16, n_boundaries=6, seed=None):
+    """
+    Generates a random valid ELECTRE Tri-B problem: the weightings are normalized to 100, the thresholds are
+        increasing and the consecutive boundary reference actions are at least one preference threshold apart on each
+        criterion, so that they are hyper-strictly separable and pass "separability_test". The performances of the
+        actions are drawn between the first and last boundary reference actions, at least one preference threshold
+        away from them, so that every action is assigned by both procedures.
+
+    :param n_actions: Number of actions.
+    :param n_criteria: Number of criteria.
+    :param n_boundaries: Number of boundary reference actions, at least 2.
+    :param seed: Seed of the random number generator.
+
+    :return PB: Problem instance.
+    :return CAT: List of the names of the n_boundaries - 1 categories.
+    """
+    if n_boundaries < 2:
+        raise NameError('At least two boundary reference actions are required')
+    rng = np.random.default_rng(seed)
+    C = ['g{}'.format(j + 1) for j in range(n_criteria)]
+    A = ['a{}'.format(i + 1) for i in range(n_actions)]
+    B = ['b{}'.format(k) for k in range(n_boundaries)]
+    CAT = ['C{}'.format(k + 1) for k in range(n_boundaries - 1)]
+    W = rng.dirichlet(np.ones(n_criteria)) * 100
+    q = rng.uniform(0.5, 2, n_criteria)
+    p = q + rng.uniform(1, 4, n_criteria)
+    v = p + rng.uniform(2, 10, n_criteria)
+    T = np.stack((q, p, v), axis=1)
+    Gaps = p * rng.uniform(1.5, 4, (n_boundaries - 1, n_criteria))
+    BP = np.concatenate((np.zeros((1, n_criteria)), np.cumsum(Gaps, axis=0)), axis=0)
+    # Each action has an overall level between the first and last boundary reference actions, perturbed on each
+    # criterion, so that the actions are spread over all the categories
+    Low, High = BP[0] + p, BP[-1] - p
+    Level = rng.uniform(0, 1, (n_actions, 1)) + rng.uniform(-0.25, 0.25, (n_actions, n_criteria))
+    AP = Low + np.clip(Level, 0, 1) * (High - Low)
+    return ELECTRE_Tri_B.Problem(C, W, A, AP, B, BP, T), CAT
+
+
+def _stages(PB, CAT, λ, Stages):
+    """
+    Generator running the stages of the pipeline one after the other and giving the name of each stage once it is
+        completed, so that the caller can measure them.
+
+    :return: Successive tuples (stage, Results) where Results is the dictionary of the results of the completed
+        stages.
+    """
+    Results = {}
+    W, BP, T = PB.weights_dict(), PB.boundaries_dict(), PB.thresholds_dict()
+    Results['requirements'] = ELECTRE_Tri_B.boundary_requirements(PB.C, W, PB.B, BP, T)
+    yield 'requirements', Results
+    Results['partial_indices'] = Stages['partial_indices'](PB.AP, PB.BP, PB.T)
+    yield 'partial_indices', Results
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = Results['partial_indices']
+    Results['global_concordance'] = Stages['global_concordance'](Conc_ab, Conc_ba, PB.W)
+    yield 'global_concordance', Results
+    Glob_ab, Glob_ba = Results['global_concordance']
+    Results['credibility'] = Stages['credibility'](Glob_ab, Glob_ba, Disc_ab, Disc_ba)
+    yield 'credibility', Results
+    Cred_ab, Cred_ba = Results['credibility']
+    Results['sorting'] = Stages['sorting'](Cred_ab, Cred_ba, λ, len(CAT))
+    yield 'sorting', Results
+    Pessi_cat, Opti_cat = Results['sorting']
+    Results['median_rank'] = (Opti_cat + Pessi_cat) / 2
+    yield 'median_rank', Results
+
+
+def time_stages(PB, CAT, λ, backend=None, repeat=3):
+    """
+    Measures the wall time of each stage of the pipeline, as the best of several runs, and its peak memory, in a
+        separate run with tracemalloc so that the tracing does not slow down the timed runs. The separability test is
+        run without its memoization.
+
+    :param PB: Problem instance.
+    :param CAT: List of the names of the categories.
+    :param λ: Cutting threshold value.
+    :param backend: Name of the compute backend (see "get_backend").
+    :param repeat: Number of timed runs.
+
+    :return Time: Dictionary containing the best wall time of each stage in seconds.
+    :return Memory: Dictionary containing the peak memory allocated during each stage in bytes, without the results of
+        the previous stages.
+    """
+    Stages = ELECTRE_Tri_B.get_backend(backend)
+    # Warm-up on a few actions, which compiles the kernels of the Numba backend
+    for _ in _stages(PB.with_actions(PB.A[:2], PB.AP[:2]), CAT, λ, Stages):
+        pass
+    Time = {stage: np.inf for stage in STAGES}
+    for _ in range(repeat):
+        ELECTRE_Tri_B.clear_requirements_cache()
+        start = time.perf_counter()
+        for stage, _ in _stages(PB, CAT, λ, Stages):
+            end = time.perf_counter()
+            Time[stage] = min(Time[stage], end - start)
+            start = time.perf_counter()
+    Memory = {}
+    ELECTRE_Tri_B.clear_requirements_cache()
+    tracemalloc.start()
+    try:
+        start_memory = 0
+        for stage, _ in _stages(PB, CAT, λ, Stages):
+            Memory[stage] = tracemalloc.get_traced_memory()[1] - start_memory
+            # The peak of the next stage is measured from the memory kept at its start
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return Time, Memory
+
+
+def discretized(PB):
+    """
+    :param PB: Problem instance.
+
+    :return: Problem instance whose actions performances are rounded to a multiple of the indifference threshold of
+        each criterion, so that the criteria take few distinct values, as discrete scores do.
+    """
+    Step = PB.T[:, 0]
+    return PB.with_actions(PB.A, np.round(np.asarray(PB.AP) / Step) * Step)
+
+
+def check_equivalence(PB, CAT, λ, backend=None, check_size=1000):
+    """
+    Checks that a backend gives exactly the same values as the reference functions of "ELECTRE_Tri_B" at each stage,
+        and on the other paths of the engine (see PATHS): the credibility indices of "credibility_indices", with the
+        sparse vetoes of the "NUMPY" backend, the partial and credibility indices of discretized performances, which
+        are calculated with lookup tables (see "discretized"), and the categories of "assign_actions" in float64 and
+        float32 precisions. The actions being classified independently from each other, the check is made on the
+        first check_size actions only, so that it stays fast for large problems.
+
+    :param PB: Problem instance.
+    :param CAT: List of the names of the categories.
+    :param λ: Cutting threshold value.
+    :param backend: Name of the compute backend (see "get_backend").
+    :param check_size: Number of actions checked.
+
+    :return: List of the names of the stages and paths whose values differ from the reference, empty if all are
+        identical.
+    """
+    PB = PB.with_actions(PB.A[:check_size], PB.AP[:check_size])
+    Stages = ELECTRE_Tri_B.get_backend(backend)
+    Reference = list(_stages(PB, CAT, λ, ELECTRE_Tri_B.get_backend('REFERENCE')))[-1][1]
+    Results = list(_stages(PB, CAT, λ, Stages))[-1][1]
+    PB_discrete = discretized(PB)
+    Reference_discrete = list(_stages(PB_discrete, CAT, λ, ELECTRE_Tri_B.get_backend('REFERENCE')))[-1][1]
+    Reference['credibility_indices'] = Reference['credibility']
+    Results['credibility_indices'] = ELECTRE_Tri_B.credibility_indices(PB.AP, PB.BP, PB.T, PB.W, Stages)
+    Reference['lookup_partial_indices'] = Reference_discrete['partial_indices']
+    Results['lookup_partial_indices'] = Stages['partial_indices'](PB_discrete.AP, PB.BP, PB.T)
+    Reference['lookup_credibility_indices'] = Reference_discrete['credibility']
+    Results['lookup_credibility_indices'] = ELECTRE_Tri_B.credibility_indices(PB_discrete.AP, PB.BP, PB.T, PB.W,
+                                                                              Stages)
+    Reference['assignment'] = Reference['float32_assignment'] = Reference['sorting']
+    Results['assignment'] = ELECTRE_Tri_B.assign_actions(PB, CAT=CAT, λ=λ, backend=backend)[:2]
+    Results['float32_assignment'] = ELECTRE_Tri_B.assign_actions(PB, CAT=CAT, λ=λ, backend=backend,
+                                                                 precision='FLOAT32')[:2]
+    Different = []
+    for stage in STAGES[1:] + PATHS:
+        reference, result = Reference[stage], Results[stage]
+        if isinstance(reference, np.ndarray):
+            reference, result = (reference,), (result,)
+        if not all(np.array_equal(x, y) for x, y in zip(reference, result)):
+            Different.append(stage)
+    return Different
+
+
+def run_benchmark(Actions, Criteria=(16,), Boundaries=(6,), backends=None, λ=0.6, repeat=3, seed=0,
+                  check_size=1000, display='NO'):
+    """
+    Runs the benchmark on generated problems of all the combinations of sizes.
+
+    :param Actions: List of the numbers of actions.
+    :param Criteria: List of the numbers of criteria.
+    :param Boundaries: List of the numbers of boundary reference actions.
+    :param backends: List of the names of the compute backends, or None for all the available backends except the
+        reference one.
+    :param λ: Cutting threshold value.
+    :param repeat: Number of timed runs of each stage.
+    :param seed: Seed of the generator of the problems.
+    :param check_size: Number of actions checked against the reference functions, 0 to skip the check.
+    :param display: Parameter allowing to choose if the display of the results is desired or not.
+
+    :return Records: List of dictionaries, one for each problem, backend and stage, with the keys 'Actions',
+        'Criteria', 'Boundaries', 'Backend', 'Stage', 'Time', 'Peak memory' and 'Equivalent', followed, when the
+        backends are checked, by one dictionary for each path of PATHS, with no time and memory.
+    """
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    if backends is None:
+        backends = [backend for backend in ELECTRE_Tri_B.available_backends() if backend != 'REFERENCE']
+    Records = []
+    for n in Actions:
+        for m in Criteria:
+            for k in Boundaries:
+                PB, CAT = generate_problem(n, m, k, seed)
+                for backend in backends:
+                    Time, Memory = time_stages(PB, CAT, λ, backend, repeat)
+                    Different = check_equivalence(PB, CAT, λ, backend, check_size) if check_size > 0 else None
+                    for stage in STAGES:
+                        Records.append({'Actions': n, 'Criteria': m, 'Boundaries': k, 'Backend': backend,
+                                        'Stage': stage, 'Time': Time[stage], 'Peak memory': Memory[stage],
+                                        'Equivalent': '' if Different is None else stage not in Different})
+                    if Different is not None:
+                        for path in PATHS:
+                            Records.append({'Actions': n, 'Criteria': m, 'Boundaries': k, 'Backend': backend,
+                                            'Stage': path, 'Time': '', 'Peak memory': '',
+                                            'Equivalent': path not in Different})
+                    if display == 'YES':
+                        print('{} actions, {} criteria, {} boundaries, {} : {:.4f} s, {:.1f} MB{}'.format(
+                            n, m, k, backend, sum(Time.values()), max(Memory.values()) / 2 ** 20,
+                            '' if not Different else ', different from the reference : ' + ', '.join(Different)))
+    return Records
+
+
+def write_results(Records, name_out):
+    """
+    :param Records: List of dictionaries returned by "run_benchmark".
+    :param name_out: Name of the output .csv file.
+    """
+    columns = ['Actions', 'Criteria', 'Boundaries', 'Backend', 'Stage', 'Time', 'Peak memory', 'Equivalent']
+    with open(name_out, 'w', newline='') as out_csv:
+        writer = csv.DictWriter(out_csv, fieldnames=columns, delimiter=',')
+        writer.writeheader()
+        writer.writerows(Records)
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the benchmark:
+        python ELECTRE_Tri_B_benchmark.py --actions 10,1000,100000 --backends NUMPY,NUMBA --output benchmark.csv
+
+    :param argv: List of the arguments, or None to use the arguments of the command line.
+
+    :return: Exit status, 0 if all the backends gave the same values as the reference functions and 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of the ELECTRE Tri-B pipeline on generated problems.')
+    parser.add_argument('--actions', default='10,100,1000,10000,100000', help='numbers of actions')
+    parser.add_argument('--criteria', default='16', help='numbers of criteria')
+    parser.add_argument('--boundaries', default='6', help='numbers of boundary reference actions')
+    parser.add_argument('--backends', default=None, help='names of the compute backends')
+    parser.add_argument('--lambda', dest='λ', type=float, default=0.6, help='cutting threshold value')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of each stage')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generator of the problems')
+    parser.add_argument('--check-size', type=int, default=1000, help='number of actions checked against the '
+                                                                     'reference functions, 0 to skip the check')
+    parser.add_argument('--output', default=None, help='output .csv file')
+    args = parser.parse_args(argv)
+
+    def sizes(text):
+        return [int(float(value)) for value in text.split(',')]
+
+    backends = args.backends.split(',') if args.backends is not None else None
+    Records = run_benchmark(sizes(args.actions), sizes(args.criteria), sizes(args.boundaries), backends, args.λ,
+                            args.repeat, args.seed, args.check_size, display='YES')
+    if args.output is not None:
+        write_results(Records, args.output)
+    return 1 if any(record['Equivalent'] is False for record in Records) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
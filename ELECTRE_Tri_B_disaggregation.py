@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 22:40
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+
+def _assignment_constraints(Category, q, procedure):
+    """
+    Writes the rules of "pessimistic_sorting" and "optimistic_sorting" as linear constraints on binary variables.
+        For each example ai, x(i,k) = 1 if ai S bk and y(i,k) = 1 if bk S ai, for k = 0, ..., q. The category h lies
+        between b(h-1) and b(h) and:
+            - the pessimistic procedure assigns ai to h if (ai > b(h-1) or ai I b(h)) and if this is not true for any
+                higher category,
+            - the optimistic procedure assigns ai to h if (b(h) > ai or ai R b(h-1)) and if this is not true for any
+                lower category.
+        The alternative of the first condition is chosen by an additional binary variable z for each example and
+        procedure, and the binary variable u(i) = 1 releases all the constraints of the example ai.
+
+    :param Category: Integer array of shape (examples,) containing the category of each example, numbered from 1.
+    :param q: Number of categories.
+    :param procedure: "BOTH", "PESSIMISTIC" or "OPTIMISTIC".
+
+    :return: List of tuples (Coefficients, ub) of the constraints sum(Coefficients[v] * v) <= ub, where the keys of
+        Coefficients are tuples ('x', i, k), ('y', i, k), ('z', i, p) with p = 0 for the pessimistic procedure and 1
+        for the optimistic one, or ('u', i).
+    """
+    Rows = []
+    for i, h in enumerate(Category.tolist()):
+        start = len(Rows)
+        x = [('x', i, k) for k in range(q + 1)]
+        y = [('y', i, k) for k in range(q + 1)]
+        if procedure in ('BOTH', 'PESSIMISTIC'):
+            z = ('z', i, 0)
+            # z = 1: ai > b(h-1), z = 0: ai I b(h)
+            Rows += [({z: 1, x[h - 1]: -1}, 0), ({z: 1, y[h - 1]: 1}, 1), ({z: -1, x[h]: -1}, -1),
+                     ({z: -1, y[h]: -1}, -1)]
+            for j in range(h, q):
+                Rows += [({x[j]: 1, y[j]: -1}, 0), ({x[j + 1]: 1, y[j + 1]: 1}, 1)]
+        if procedure in ('BOTH', 'OPTIMISTIC'):
+            z = ('z', i, 1)
+            # z = 1: b(h) > ai, z = 0: ai R b(h-1)
+            Rows += [({z: 1, y[h]: -1}, 0), ({z: 1, x[h]: 1}, 1), ({z: -1, x[h - 1]: 1}, 0),
+                     ({z: -1, y[h - 1]: 1}, 0)]
+            for j in range(h - 1):
+                Rows += [({y[j + 1]: 1, x[j + 1]: -1}, 0), ({x[j]: -1, y[j]: -1}, -1)]
+        # The left-hand side of each constraint exceeds its bound by at most 1
+        for Coefficients, _ in Rows[start:]:
+            Coefficients[('u', i)] = -1
+    return Rows
+
+
+def ELECTRE_Tri_B_disaggregation(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, Examples=None,
+                                 λ=None, Λ=None, procedure='PESSIMISTIC', W_min=0, display='NO'):
+    """
+    Infers the weightings and the cutting threshold from example assignments. The partial concordance and
+        discordance indices of the examples and of the pairs of consecutive boundary reference actions do not depend
+        on the weightings and are calculated only once. For a given λ, every condition on a credibility index is then
+        a linear condition on the weightings (see "ELECTRE_Tri_B.concordance_thresholds"), and the weightings are
+        given by a mixed integer linear program whose binary variables are the outranking relations of the examples
+        with the boundary reference actions (see "_assignment_constraints"). It maximizes the margin ε by which all the
+        conditions are met, including the separability conditions tested by "requirements_test", after minimizing the
+        number of examples which cannot be reproduced. The program is solved for each value of λ, and the best value is
+        kept. As for "ELECTRE_Tri_B", the data can be given as a single Problem instance in place of C.
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion. It is not used, the weightings being inferred.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param Examples: Dictionary giving the name of the category of each example action.
+    :param λ: Cutting threshold value, or None to infer it among the values of Λ.
+    :param Λ: List of the cutting threshold values tried when λ is None, by default from 0.5 to 1 by steps of 0.05.
+    :param procedure: Procedure whose assignments must reproduce the examples, "PESSIMISTIC", "OPTIMISTIC" or "BOTH".
+    :param W_min: Minimum weighting of each criterion, the weightings summing to 100.
+    :param display: Parameter allowing to choose if the display of the results is desired or not.
+
+    :return W: Dictionary containing the inferred weightings of each criterion, summing to 100.
+    :return λ: Inferred cutting threshold value.
+    :return ε: Margin of the conditions on the credibility indices of the reproduced examples.
+    :return Inconsistent: List of the example actions which are not assigned to their category by the inferred model,
+        empty if all the examples are reproduced. When the examples are not consistent with each other, the smallest
+        number of them is left out.
+    """
+    if not isinstance(C, ELECTRE_Tri_B.Problem) and W is None:
+        W = {c: 1 for c in C}
+    PB = ELECTRE_Tri_B.as_problem(C, W, A, AP, B, BP, T)
+    if CAT is None or Examples is None:
+        raise NameError('The categories "CAT" and the example assignments "Examples" must be given')
+    if procedure not in ('BOTH', 'PESSIMISTIC', 'OPTIMISTIC'):
+        raise NameError('The variable "procedure" must be equal to "BOTH", "PESSIMISTIC" or "OPTIMISTIC"')
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    if len(PB.B) < len(CAT) + 1:
+        raise NameError('The number of boundary reference actions must be at least the number of categories plus one')
+    for gj in range(len(PB.C)):
+        if not PB.T[gj][0] < PB.T[gj][1] < PB.T[gj][2]:
+            raise NameError('Condition of increasing order of thresholds is not respected')
+    E = list(Examples)
+    for a in E:
+        if a not in PB.A_index:
+            raise NameError('The example action {} is not one of the actions'.format(a))
+        if Examples[a] not in CAT:
+            raise NameError('The category of the example action {} is not one of the categories'.format(a))
+    if λ is not None:
+        Λ = [λ]
+    elif Λ is None:
+        Λ = np.round(np.arange(0.5, 1.0001, 0.05), 2)
+    q = len(CAT)
+    Category = np.array([CAT.index(Examples[a]) + 1 for a in E], dtype=int)
+
+    # The partial concordance and discordance indices do not depend on the weightings and are calculated only once
+    G_E = PB.AP[[PB.A_index[a] for a in E]]
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = ELECTRE_Tri_B.partial_indices_arrays(G_E, PB.BP, PB.T)
+    Pairs_conc, _, Pairs_disc, _ = ELECTRE_Tri_B.partial_indices_arrays(PB.BP[:-1], PB.BP[1:], PB.T)
+    k = np.arange(len(PB.B) - 1)
+    Pairs_conc, Pairs_disc = Pairs_conc[k, k], Pairs_disc[k, k]
+    # Outranking relations of the examples with the boundary reference actions, x then y, of shape (atoms, criteria)
+    Atoms_conc = np.concatenate((Conc_ab[:, :q + 1], Conc_ba[:, :q + 1]), axis=1).reshape(-1, len(PB.C))
+    Atoms_disc = np.concatenate((Disc_ab[:, :q + 1], Disc_ba[:, :q + 1]), axis=1).reshape(-1, len(PB.C))
+
+    # Variables: the weightings normalized to 1, ε, the binary variables x and y of the outranking relations and the
+    # binary variables z of the alternatives of the assignment rules
+    m = len(PB.C)
+    n_atoms = len(Atoms_conc)
+    index = {}
+    for i in range(len(E)):
+        for k in range(q + 1):
+            index[('x', i, k)] = m + 1 + i * 2 * (q + 1) + k
+            index[('y', i, k)] = m + 1 + i * 2 * (q + 1) + q + 1 + k
+        index[('z', i, 0)] = m + 1 + n_atoms + 2 * i
+        index[('z', i, 1)] = m + 1 + n_atoms + 2 * i + 1
+        index[('u', i)] = m + 1 + n_atoms + 2 * len(E) + i
+    n_var = m + 1 + n_atoms + 3 * len(E)
+    Rules = _assignment_constraints(Category, q, procedure)
+    # Each binary variable s of an outranking relation with threshold C_x is linked to the weightings by
+    #   s = 1 => C >= C_x + ε, written as -C + ε + 2 s - 2 u <= 2 - C_x,
+    #   s = 0 => C <= C_x - ε, written as C + ε - 2 s - 2 u <= C_x,
+    # and the separability conditions σ(bk,bk+1) <= min(λ, 1/2) are written as C + ε <= C_x. A complete veto makes
+    # the credibility index zero whatever the weightings, unless C = 1: the relation is then false and C is only
+    # kept below 1 - 1e-3, without margin.
+    Atoms_veto = Atoms_disc.max(axis=1) >= 1
+    Pairs_veto = Pairs_disc.max(axis=1) >= 1
+    Matrix = np.zeros((2 * n_atoms + len(Rules) + len(Pairs_conc) + 1, n_var))
+    Atoms = np.arange(n_atoms)
+    Released = m + 1 + n_atoms + 2 * len(E) + Atoms // (2 * (q + 1))
+    Matrix[Atoms, :m] = -Atoms_conc
+    Matrix[Atoms, m] = ~Atoms_veto
+    Matrix[Atoms, m + 1 + Atoms] = 2
+    Matrix[Atoms, Released] = -2
+    Matrix[n_atoms + Atoms, :m] = Atoms_conc
+    Matrix[n_atoms + Atoms, m] = ~Atoms_veto
+    Matrix[n_atoms + Atoms, m + 1 + Atoms] = -2
+    Matrix[n_atoms + Atoms, Released] = -2
+    Rules_ub = []
+    for r, (Coefficients, ub) in enumerate(Rules):
+        for variable, coefficient in Coefficients.items():
+            Matrix[2 * n_atoms + r, index[variable]] = coefficient
+        Rules_ub.append(ub)
+    Matrix[2 * n_atoms + len(Rules):-1, :m] = Pairs_conc
+    Matrix[2 * n_atoms + len(Rules):-1, m] = ~Pairs_veto
+    # Weightings normalized to 1, written as the last row with lower bound 1
+    Matrix[-1, :m] = 1
+    # The number of released examples is minimized first, then the margin ε, lower than 1, is maximized
+    objective = np.zeros(n_var)
+    objective[m] = -1 / 2
+    objective[n_var - len(E):] = 1
+    integrality = np.concatenate((np.zeros(m + 1), np.ones(n_var - m - 1)))
+    Lower = np.concatenate((np.full(m, W_min / 100), np.zeros(n_var - m)))
+    Upper = np.ones(n_var)
+    Upper[m + 1:m + 1 + n_atoms] = np.where(Atoms_veto, 0, 1)
+    best = None
+    for λ_value in Λ:
+        Thresholds = np.where(Atoms_veto, 1 - 1e-3, ELECTRE_Tri_B.concordance_thresholds(Atoms_disc, λ_value))
+        Pairs_thresholds = np.where(Pairs_veto, 1 - 1e-3,
+                                    ELECTRE_Tri_B.concordance_thresholds(Pairs_disc, min(λ_value, 1 / 2)))
+        Upper_bounds = np.concatenate((2 - Thresholds, Thresholds, Rules_ub, Pairs_thresholds, [1]))
+        Lower_bounds = np.full(len(Matrix), -np.inf)
+        Lower_bounds[-1] = 1
+        result = milp(objective, integrality=integrality, bounds=Bounds(Lower, Upper),
+                      constraints=LinearConstraint(Matrix, Lower_bounds, Upper_bounds))
+        if result.status == 0 and (best is None or result.fun < best[3]):
+            best = (result.x[:m], λ_value, result.x[m], result.fun)
+    if best is None:
+        raise NameError('No weightings respect the minimum weighting "W_min" and the separability conditions')
+    W_norm, λ, ε, _ = best
+
+    # Check of the inferred model with the exact calculation of the credibility indices
+    W_norm = np.clip(W_norm, W_min / 100, None)
+    W_array = W_norm / W_norm.sum() * 100
+    Glob_ab, Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(Conc_ab, Conc_ba, W_array)
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_arrays(Glob_ab, Glob_ba, Disc_ab, Disc_ba)
+    Pessi_cat, Opti_cat = ELECTRE_Tri_B.sorting_arrays(ELECTRE_Tri_B.relations_arrays(Cred_ab, Cred_ba, λ), q)
+    reproduced = np.ones(len(E), dtype=bool)
+    if procedure in ('BOTH', 'PESSIMISTIC'):
+        reproduced &= Pessi_cat == Category
+    if procedure in ('BOTH', 'OPTIMISTIC'):
+        reproduced &= Opti_cat == Category
+    Inconsistent = [a for a, ok in zip(E, reproduced.tolist()) if not ok]
+    W = dict(zip(PB.C, W_array.tolist()))
+
+    if display == 'YES':
+        print(' ')
+        print('Inferred weightings :', {c: round(w, 3) for c, w in W.items()})
+        print('Inferred cutting threshold λ =', λ, ', margin ε =', round(float(ε), 6))
+        if Inconsistent:
+            print('Examples not reproduced :', Inconsistent)
+
+    return W, float(λ), float(ε), Inconsistent
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 16:20
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+
+
+class Evaluator:
+    """
+    Stateful evaluation of an ELECTRE Tri-B problem which keeps the concordance, discordance, global concordance and
+        credibility indices of all the actions against all the boundary reference actions. When the problem is
+        updated, only the affected actions (rows), boundary reference actions (slices) or indices are recalculated,
+        and the results are the same as those of a complete run of "ELECTRE_Tri_B" on the updated data.
+
+    :param PB: Problem instance.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    """
+
+    def __init__(self, PB, CAT, λ):
+        self.PB = ELECTRE_Tri_B.Problem(PB.C, PB.W.copy(), PB.A, PB.AP.copy(), PB.B, PB.BP.copy(), PB.T)
+        self.CAT = list(CAT)
+        self.λ = λ
+        self.Sigma_bk, self.Separability = self._requirements(self.PB.W, self.PB.BP, λ)
+        self.Conc_ab, self.Conc_ba, self.Disc_ab, self.Disc_ba = \
+            ELECTRE_Tri_B.partial_indices_arrays(self.PB.AP, self.PB.BP, self.PB.T)
+        self.Glob_ab, self.Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(self.Conc_ab, self.Conc_ba, self.PB.W)
+        self.Cred_ab, self.Cred_ba = ELECTRE_Tri_B.credibility_arrays(self.Glob_ab, self.Glob_ba, self.Disc_ab,
+                                                                      self.Disc_ba)
+        self.Pessi_cat, self.Opti_cat = self._sorting(slice(None))
+
+    def _requirements(self, W, BP, λ):
+        """
+        Tests the minimum requirements on the weightings and boundary reference actions before they are used.
+
+        :return: Sigma_bk, Separability as returned by "requirements_test".
+        """
+        PB = self.PB
+        return ELECTRE_Tri_B.requirements_test(PB.C, dict(zip(PB.C, W.tolist())), PB.B,
+                                               {b: dict(zip(PB.C, row)) for b, row in zip(PB.B, BP.tolist())},
+                                               PB.thresholds_dict(), λ)
+
+    def _sorting(self, rows):
+        """
+        :param rows: Index of the actions to classify.
+
+        :return: Pessi_cat, Opti_cat arrays of the pessimistic and optimistic categories of these actions.
+        """
+        return ELECTRE_Tri_B.sorting_arrays(ELECTRE_Tri_B.relations_arrays(self.Cred_ab[rows], self.Cred_ba[rows],
+                                                                           self.λ), len(self.CAT))
+
+    def update_action(self, a, performances):
+        """
+        Changes the performances of an action and recalculates only the indices of this action.
+
+        :param a: Name of the action.
+        :param performances: Dictionary containing the new performance of the action for some or all the criteria.
+        """
+        PB = self.PB
+        i = PB.A_index[a]
+        for c, value in performances.items():
+            PB.AP[i, PB.C_index[c]] = value
+        rows = slice(i, i + 1)
+        Conc_ab, Conc_ba, Disc_ab, Disc_ba = ELECTRE_Tri_B.partial_indices_arrays(PB.AP[rows], PB.BP, PB.T)
+        self.Conc_ab[rows], self.Conc_ba[rows], self.Disc_ab[rows], self.Disc_ba[rows] = \
+            Conc_ab, Conc_ba, Disc_ab, Disc_ba
+        self.Glob_ab[rows], self.Glob_ba[rows] = ELECTRE_Tri_B.global_concordance_arrays(Conc_ab, Conc_ba, PB.W)
+        self.Cred_ab[rows], self.Cred_ba[rows] = ELECTRE_Tri_B.credibility_arrays(self.Glob_ab[rows],
+                                                                                  self.Glob_ba[rows], Disc_ab, Disc_ba)
+        self.Pessi_cat[rows], self.Opti_cat[rows] = self._sorting(rows)
+
+    def update_weights(self, weights):
+        """
+        Changes the weightings of some criteria. The concordance and discordance indices do not depend on the
+            weightings and are kept; only the global concordance and credibility indices are recalculated.
+
+        :param weights: Dictionary containing the new weighting of some or all the criteria.
+        """
+        PB = self.PB
+        W = PB.W.copy()
+        for c, value in weights.items():
+            W[PB.C_index[c]] = value
+        self.Sigma_bk, self.Separability = self._requirements(W, PB.BP, self.λ)
+        PB.W[:] = W
+        self.Glob_ab, self.Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(self.Conc_ab, self.Conc_ba, PB.W)
+        self.Cred_ab, self.Cred_ba = ELECTRE_Tri_B.credibility_arrays(self.Glob_ab, self.Glob_ba, self.Disc_ab,
+                                                                      self.Disc_ba)
+        self.Pessi_cat, self.Opti_cat = self._sorting(slice(None))
+
+    def update_boundary(self, b, performances):
+        """
+        Changes the performances of a boundary reference action and recalculates only the indices of all the actions
+            with regard to this boundary reference action.
+
+        :param b: Name of the boundary reference action.
+        :param performances: Dictionary containing the new performance of the boundary reference action for some or
+            all the criteria.
+        """
+        PB = self.PB
+        k = PB.B_index[b]
+        BP = PB.BP.copy()
+        for c, value in performances.items():
+            BP[k, PB.C_index[c]] = value
+        self.Sigma_bk, self.Separability = self._requirements(PB.W, BP, self.λ)
+        PB.BP[:] = BP
+        cols = slice(k, k + 1)
+        Conc_ab, Conc_ba, Disc_ab, Disc_ba = ELECTRE_Tri_B.partial_indices_arrays(PB.AP, PB.BP[cols], PB.T)
+        self.Conc_ab[:, cols], self.Conc_ba[:, cols], self.Disc_ab[:, cols], self.Disc_ba[:, cols] = \
+            Conc_ab, Conc_ba, Disc_ab, Disc_ba
+        self.Glob_ab[:, cols], self.Glob_ba[:, cols] = ELECTRE_Tri_B.global_concordance_arrays(Conc_ab, Conc_ba, PB.W)
+        self.Cred_ab[:, cols], self.Cred_ba[:, cols] = \
+            ELECTRE_Tri_B.credibility_arrays(self.Glob_ab[:, cols], self.Glob_ba[:, cols], Disc_ab, Disc_ba)
+        self.Pessi_cat, self.Opti_cat = self._sorting(slice(None))
+
+    def update_lambda(self, λ):
+        """
+        Changes the cutting threshold. Only the outranking relations and the sorting are recalculated.
+
+        :param λ: Cutting threshold value.
+        """
+        if λ < max(self.Sigma_bk.values()):
+            raise NameError('The chosen credibility threshold is lower than the minimum required credibility '
+                            'threshold λ_min = {}'.format(max(self.Sigma_bk.values())))
+        self.λ = λ
+        self.Pessi_cat, self.Opti_cat = self._sorting(slice(None))
+
+    def results(self):
+        """
+        :return: Pessi_sort, Opti_sort, Med_rank in the same format as returned by "ELECTRE_Tri_B".
+        """
+        Pessi_sort = ELECTRE_Tri_B.sorting_from_categories(self.Pessi_cat, self.CAT, self.PB.A)
+        Opti_sort = ELECTRE_Tri_B.sorting_from_categories(self.Opti_cat, self.CAT, self.PB.A)
+        Med_rank = ELECTRE_Tri_B.median_rank(Pessi_sort, Opti_sort, self.PB.A)
+        return Pessi_sort, Opti_sort, Med_rank
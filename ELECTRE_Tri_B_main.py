@@ -115,3 +115,14 @@ print('Optimistic category : ', Opti_sort[1])
 # Display of the median rank of each action
 print(' ')
 ELECTRE_Tri_B.display_results(Pessi_sort, Opti_sort, Med_rank, A)
+
+########################################################################################################################
+# ===================================   Sweep of the cutting threshold λ   ========================================== #
+########################################################################################################################
+
+# The credibility indices are calculated once and the actions are classified for each cutting threshold of the grid
+Λ = [round(λ_min + 0.01 * i, 2) for i in range(int((1 - λ_min) * 100) + 1)]
+Pessi_cat, Opti_cat, Med_rank_Λ, Breakpoints = ELECTRE_Tri_B.lambda_sweep(C, W, A, AP, B, BP, T, CAT, Λ)
+print(' ')
+print('Values of λ at which at least one action changes of category :', [round(β, 3) for β in Breakpoints.tolist()
+                                                                          if β >= λ_min])
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 21:10
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import numpy as np
+import concurrent.futures
+
+
+def tiles(n, tile_size):
+    """
+    Splits the action x action matrix into square tiles. Only the tiles on and above the diagonal are given, the tile
+        below the diagonal being the transpose of the credibility indices σ(bk,ai) of the tile above it.
+
+    :param n: Number of actions.
+    :param tile_size: Number of actions of each side of a tile.
+
+    :return: List of the tiles ((i0, i1), (j0, j1)) such that i0 <= j0.
+    """
+    Limits = [(i, min(i + tile_size, n)) for i in range(0, n, tile_size)]
+    return [(Limits[I], Limits[J]) for I in range(len(Limits)) for J in range(I, len(Limits))]
+
+
+def _compute_tile(CRED, G, T, W, Stages, tile):
+    """
+    Calculates the credibility indices of a tile and of its transpose and writes them in the matrix CRED.
+    """
+    (i0, i1), (j0, j1) = tile
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_indices(G[i0:i1], G[j0:j1], T, W, Stages)
+    CRED[i0:i1, j0:j1] = Cred_ab
+    CRED[j0:j1, i0:i1] = Cred_ba.T
+
+
+_worker_data = None
+
+
+def _init_worker(*data):
+    """
+    Keeps in each process of the pool the arrays which are common to all the tiles, so that they are sent only once
+        to each process.
+    """
+    global _worker_data
+    _worker_data = data
+
+
+def _worker_tile(tile):
+    """
+    :param tile: Tile ((i0, i1), (j0, j1)) of the matrix.
+
+    :return: The tile and its credibility indices, or None for the indices if they are written in the memory-mapped
+        file given to "_init_worker".
+    """
+    G, T, W, backend, name_memmap = _worker_data
+    Stages = ELECTRE_Tri_B.get_backend(backend)
+    if name_memmap is not None:
+        CRED = np.load(name_memmap, mmap_mode='r+')
+        _compute_tile(CRED, G, T, W, Stages, tile)
+        CRED.flush()
+        return tile, None, None
+    (i0, i1), (j0, j1) = tile
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_indices(G[i0:i1], G[j0:j1], T, W, Stages)
+    return tile, Cred_ab, Cred_ba
+
+
+def outranking_matrix(G, T, W, tile_size=256, processes=None, name_memmap=None, backend=None):
+    """
+    Calculates the credibility indices σ(ai,aj) of all the pairs of actions, with the same values as the ones given
+        by the "credibility" function when each action is taken in turn as a boundary reference action. The matrix is
+        calculated by square tiles, small enough for the partial indices of a tile to stay in the cache, and each tile
+        also gives the transposed tile through the credibility indices σ(bk,ai), so that only half of the tiles are
+        calculated. The tiles can be spread over a pool of processes and the matrix can be written in a
+        memory-mapped .npy file, so that it does not need to fit in memory.
+
+    :param G: Array of shape (actions, criteria) containing the actions performances.
+    :param T: Array of shape (criteria, 3) containing the indifference, preference and veto thresholds.
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+    :param tile_size: Number of actions of each side of a tile.
+    :param processes: Number of processes used to calculate the tiles, or None to calculate them in this process.
+    :param name_memmap: Name of the .npy file in which the matrix is written, or None to keep it in memory.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+
+    :return Cred: Array, or memory-mapped array, of shape (actions, actions) containing the credibility indices
+        σ(ai,aj) of the outranking of the action of each row over the action of each column.
+    """
+    if tile_size < 1:
+        raise NameError('The size of the tiles must be a positive integer')
+    n = G.shape[0]
+    Stages = ELECTRE_Tri_B.get_backend(backend)
+    if name_memmap is None:
+        Cred = np.empty((n, n))
+    else:
+        Cred = np.lib.format.open_memmap(name_memmap, mode='w+', dtype=np.float64, shape=(n, n))
+    Tiles = tiles(n, tile_size)
+    if processes is None:
+        for tile in Tiles:
+            _compute_tile(Cred, G, T, W, Stages, tile)
+    else:
+        if name_memmap is not None:
+            Cred.flush()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                                    initargs=(G, T, W, backend, name_memmap)) as pool:
+            for ((i0, i1), (j0, j1)), Cred_ab, Cred_ba in pool.map(_worker_tile, Tiles):
+                if Cred_ab is not None:
+                    Cred[i0:i1, j0:j1] = Cred_ab
+                    Cred[j0:j1, i0:i1] = Cred_ba.T
+        if name_memmap is not None:
+            # The tiles were written by the processes in the file
+            Cred = np.load(name_memmap, mmap_mode='r+')
+    return Cred
+
+
+def qualification_scores(CRED, λ, block_size=1024):
+    """
+    Calculates the qualification score of each action, i.e. the number of actions it outranks minus the number of
+        actions which outrank it, the outranking being σ(ai,aj) >= λ. The matrix is read by blocks of rows, so that it
+        can be a memory-mapped array.
+
+    :param CRED: Array of shape (actions, actions) containing the credibility indices σ(ai,aj).
+    :param λ: Cutting threshold value.
+    :param block_size: Number of rows read at once.
+
+    :return Qualification: Integer array of shape (actions,) containing the qualification score of each action.
+    """
+    n = CRED.shape[0]
+    Strength = np.zeros(n, dtype=np.int64)
+    Weakness = np.zeros(n, dtype=np.int64)
+    for i0 in range(0, n, block_size):
+        Outranking = np.asarray(CRED[i0:i0 + block_size]) >= λ
+        Strength[i0:i0 + block_size] = Outranking.sum(axis=1)
+        Weakness += Outranking.sum(axis=0)
+    return Strength - Weakness
+
+
+def rank_within_categories(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, λ=None,
+                           procedure='PESSIMISTIC', tile_size=256, processes=None, name_memmap=None, backend=None,
+                           display='NO'):
+    """
+    Ranks the actions inside each category. The actions are assigned by "assign_actions", then the credibility
+        indices of all the pairs of actions of each category are calculated by "outranking_matrix" and the actions
+        are ranked by decreasing qualification score (see "qualification_scores"). As for "ELECTRE_Tri_B", the data
+        can be given as a single Problem instance in place of C.
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value, used for the assignments and for the outranking between the actions.
+    :param procedure: "PESSIMISTIC" or "OPTIMISTIC", procedure giving the categories of the actions.
+    :param tile_size: Number of actions of each side of a tile (see "outranking_matrix").
+    :param processes: Number of processes used to calculate the tiles, or None to calculate them in this process.
+    :param name_memmap: Name of the .npy files in which the matrices are written, containing "{}" which is replaced
+        by the name of the category, or None to keep the matrices in memory.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param display: Parameter allowing to choose if the display of the results is desired or not.
+
+    :return Ranking: Dictionary containing for each category the list of its actions, from the best to the worst.
+    :return Qualification: Dictionary containing the qualification score of each action inside its category.
+    """
+    PB = ELECTRE_Tri_B.as_problem(C, W, A, AP, B, BP, T)
+    if procedure != 'PESSIMISTIC' and procedure != 'OPTIMISTIC':
+        raise NameError('The variable "procedure" must be equal to "PESSIMISTIC" or "OPTIMISTIC"')
+    if name_memmap is not None and '{}' not in name_memmap:
+        raise NameError('The name of the memory-mapped files must contain "{}" for the name of the category')
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    Pessi_cat, Opti_cat, _ = ELECTRE_Tri_B.assign_actions(PB, CAT=CAT, λ=λ, procedure=procedure, backend=backend)
+    Category = Pessi_cat if procedure == 'PESSIMISTIC' else Opti_cat
+
+    Ranking = {}
+    Qualification = {}
+    for h, cat in enumerate(CAT):
+        Rows = np.flatnonzero(Category == h + 1)
+        name = None if name_memmap is None else name_memmap.format(cat)
+        Cred = outranking_matrix(PB.AP[Rows], PB.T, PB.W, tile_size, processes, name, backend)
+        Scores = qualification_scores(Cred, λ)
+        Order = np.argsort(-Scores, kind='stable')
+        Ranking[cat] = [PB.A[Rows[i]] for i in Order]
+        Qualification.update((PB.A[Rows[i]], int(Scores[i])) for i in range(len(Rows)))
+
+    if display == 'YES':
+        print(' ')
+        for cat in CAT:
+            print('{} :'.format(cat), [(a, Qualification[a]) for a in Ranking[cat]])
+
+    return Ranking, Qualification
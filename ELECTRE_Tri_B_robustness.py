@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 14:05
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import numpy as np
+import concurrent.futures
+
+TOLERANCE = 1e-12
+
+
+def sample_weights(W, N, method='SIMPLEX', spread=0.1, seed=None):
+    """
+    Draws random vectors of weightings with the same sum as the weightings given as input.
+
+    :param W: Array of shape (criteria,) containing the reference weightings.
+    :param N: Number of vectors of weightings to draw.
+    :param method: "SIMPLEX" to draw the weightings uniformly on the whole simplex, or "PERTURBATION" to draw each
+        weighting uniformly in [(1 - spread) * w, (1 + spread) * w] around the reference weightings.
+    :param spread: Relative amplitude of the perturbation of the weightings for the "PERTURBATION" method.
+    :param seed: Seed of the random number generator.
+
+    :return W_samples: Array of shape (N, criteria) containing the vectors of weightings.
+    """
+    W = np.asarray(W, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    if method == 'SIMPLEX':
+        W_samples = rng.dirichlet(np.ones(len(W)), size=N)
+    elif method == 'PERTURBATION':
+        W_samples = W * (1 + rng.uniform(-spread, spread, size=(N, len(W))))
+        W_samples = np.clip(W_samples, 0, None)
+        W_samples = W_samples / W_samples.sum(axis=1, keepdims=True)
+    else:
+        raise NameError('The variable "method" must be equal to "SIMPLEX" or "PERTURBATION"')
+    return W_samples * W.sum()
+
+
+def _categories_counts(W_samples, Conc_ab, Conc_ba, Disc_ab, Disc_ba, Sigma_ab, Sigma_disc, λ, q):
+    """
+    Classifies the actions for a batch of vectors of weightings and counts, for each action, how many times it is
+        assigned to each category. The partial concordance and discordance indices do not depend on the weightings and
+        are reused: the global concordance indices of all the vectors of weightings are given by a single matrix
+        product.
+
+    :param W_samples: Array of shape (samples, criteria) containing the vectors of weightings.
+    :param Conc_ab: Array of shape (actions, boundaries, criteria) containing the concordance indices c(ai,bk).
+    :param Conc_ba: Array of shape (actions, boundaries, criteria) containing the concordance indices c(bk,ai).
+    :param Disc_ab: Array of shape (actions, boundaries, criteria) containing the discordance indices d(ai,bk).
+    :param Disc_ba: Array of shape (actions, boundaries, criteria) containing the discordance indices d(bk,ai).
+    :param Sigma_ab: Array of shape (pairs, criteria) containing the concordance indices c(bk,bk+1) of the pairs of
+        consecutive boundary reference actions.
+    :param Sigma_disc: Array of shape (pairs, criteria) containing the discordance indices d(bk,bk+1).
+    :param λ: Cutting threshold value.
+    :param q: Number of categories.
+
+    :return Pessi_count: Array of shape (actions, categories + 1) counting the pessimistic assignments. The first
+        column counts the actions which could not be assigned.
+    :return Opti_count: Array of shape (actions, categories + 1) counting the optimistic assignments.
+    :return N_valid: Number of vectors of weightings for which the separability conditions are respected.
+    """
+    W_norm = W_samples / W_samples.sum(axis=1, keepdims=True)
+    # Separability of the boundary reference actions for each vector of weightings
+    Glob_pairs = W_norm @ Sigma_ab.T
+    Cred_pairs, _ = ELECTRE_Tri_B.credibility_arrays(Glob_pairs, Glob_pairs, Sigma_disc, Sigma_disc)
+    λ_min = Cred_pairs.max(axis=1) if Cred_pairs.shape[1] > 0 else np.zeros(len(W_norm))
+    valid = (λ_min <= 1 / 2) & (λ_min <= λ)
+    W_norm = W_norm[valid]
+    # Global concordance for all the vectors of weightings at once, of shape (samples, actions, boundaries)
+    Glob_ab = np.tensordot(W_norm, Conc_ab, axes=([1], [2]))
+    Glob_ba = np.tensordot(W_norm, Conc_ba, axes=([1], [2]))
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_arrays(Glob_ab, Glob_ba, Disc_ab, Disc_ba)
+    Pessi_cat, Opti_cat = ELECTRE_Tri_B.sorting_arrays(ELECTRE_Tri_B.relations_arrays(Cred_ab, Cred_ba, λ), q)
+    n = Conc_ab.shape[0]
+    Pessi_count = np.zeros((n, q + 1), dtype=np.int64)
+    Opti_count = np.zeros((n, q + 1), dtype=np.int64)
+    for cat in range(q + 1):
+        Pessi_count[:, cat] = (Pessi_cat == cat).sum(axis=0)
+        Opti_count[:, cat] = (Opti_cat == cat).sum(axis=0)
+    return Pessi_count, Opti_count, int(valid.sum())
+
+
+_worker_data = None
+
+
+def _init_worker(*data):
+    """
+    Keeps in each process of the pool the arrays which are common to all the batches, so that they are sent only
+        once to each process.
+    """
+    global _worker_data
+    _worker_data = data
+
+
+def _worker_counts(W_samples):
+    """
+    :param W_samples: Array of shape (samples, criteria) containing a batch of vectors of weightings.
+
+    :return: Result of "_categories_counts" for this batch and the arrays given to "_init_worker".
+    """
+    return _categories_counts(W_samples, *_worker_data)
+
+
+def acceptability_indices(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, λ=None, N=1000,
+                          method='SIMPLEX', spread=0.1, seed=None, batch_size=100, processes=None, display='NO'):
+    """
+    Robustness analysis of the assignments with regard to the uncertainty on the weightings. The ELECTRE Tri-B method
+        is run for N random vectors of weightings and the frequency at which each action is assigned to each category
+        (category acceptability index) is calculated. The vectors of weightings for which the boundary reference
+        actions are not at least strictly separable, or for which λ is lower than the minimum required credibility
+        threshold, are discarded. As for "ELECTRE_Tri_B", the data can be given as a single Problem instance in place
+        of C.
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the reference weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param N: Number of vectors of weightings drawn.
+    :param method: Sampling method of the weightings, "SIMPLEX" or "PERTURBATION" (see "sample_weights").
+    :param spread: Relative amplitude of the perturbation of the weightings for the "PERTURBATION" method.
+    :param seed: Seed of the random number generator.
+    :param batch_size: Number of vectors of weightings evaluated at once.
+    :param processes: Number of processes used to evaluate the batches, or None to evaluate them in this process.
+    :param display: Parameter allowing to choose if the display of the results is desired or not.
+
+    :return Pessi_acc: Dictionary containing for each action a dictionary of the frequency of its pessimistic
+        assignment to each category.
+    :return Opti_acc: Dictionary containing for each action a dictionary of the frequency of its optimistic
+        assignment to each category.
+    :return N_valid: Number of vectors of weightings for which the separability conditions are respected.
+    """
+    PB = ELECTRE_Tri_B.as_problem(C, W, A, AP, B, BP, T)
+    if CAT is None or λ is None:
+        raise NameError('The categories "CAT" and the cutting threshold "λ" must be given')
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    for gj in range(len(PB.C)):
+        if not PB.T[gj][0] < PB.T[gj][1] < PB.T[gj][2]:
+            raise NameError('Condition of increasing order of thresholds is not respected')
+    q = len(CAT)
+
+    # The partial concordance and discordance indices do not depend on the weightings and are calculated only once
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = ELECTRE_Tri_B.partial_indices_arrays(PB.AP, PB.BP, PB.T)
+    Pairs_conc, _, Pairs_disc, _ = ELECTRE_Tri_B.partial_indices_arrays(PB.BP[:-1], PB.BP[1:], PB.T)
+    k = np.arange(len(PB.B) - 1)
+    Sigma_ab = Pairs_conc[k, k, :]
+    Sigma_disc = Pairs_disc[k, k, :]
+    data = (Conc_ab, Conc_ba, Disc_ab, Disc_ba, Sigma_ab, Sigma_disc, λ, q)
+
+    W_samples = sample_weights(PB.W, N, method, spread, seed)
+    batches = [W_samples[i:i + batch_size] for i in range(0, N, batch_size)]
+    if processes is None:
+        results = [_categories_counts(batch, *data) for batch in batches]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                                    initargs=data) as pool:
+            results = list(pool.map(_worker_counts, batches))
+    Pessi_count = sum(result[0] for result in results)
+    Opti_count = sum(result[1] for result in results)
+    N_valid = sum(result[2] for result in results)
+
+    Pessi_acc = {}
+    Opti_acc = {}
+    for i, a in enumerate(PB.A):
+        Pessi_acc[a] = {CAT[j]: float(Pessi_count[i][j + 1] / max(N_valid, 1)) for j in range(q)}
+        Opti_acc[a] = {CAT[j]: float(Opti_count[i][j + 1] / max(N_valid, 1)) for j in range(q)}
+
+    if display == 'YES':
+        print(' ')
+        print('Number of valid vectors of weightings :', N_valid, '/', N)
+        for a in PB.A:
+            print('Action ' + a + ' pessimistic :', {cat: round(Pessi_acc[a][cat], 3) for cat in CAT},
+                  'optimistic :', {cat: round(Opti_acc[a][cat], 3) for cat in CAT})
+
+    return Pessi_acc, Opti_acc, N_valid
+
+
+def lambda_intervals_arrays(CRED_AB, CRED_BA, λ, q):
+    """
+    Calculates, for each action, the interval of the cutting threshold over which its pessimistic and optimistic
+        categories stay the same. The relations of an action only change when λ crosses one of its credibility
+        indices: the categories are calculated once on each interval between its sorted credibility indices.
+
+    :param CRED_AB: Array of shape (actions, boundaries) containing the credibility indices σ(ai,bk).
+    :param CRED_BA: Array of shape (actions, boundaries) containing the credibility indices σ(bk,ai).
+    :param λ: Cutting threshold value.
+    :param q: Number of categories.
+
+    :return Lambda_min: Array of shape (actions,) containing the lower bound of the interval, excluded, or 0.
+    :return Lambda_max: Array of shape (actions,) containing the upper bound of the interval, included, or 1.
+    """
+    n = CRED_AB.shape[0]
+    # The relations are the same for all the values of λ in (Points[t - 1], Points[t]]
+    Points = np.sort(np.concatenate([np.clip(CRED_AB, 0, 1), np.clip(CRED_BA, 0, 1), np.ones((n, 1))], axis=1),
+                     axis=1)
+    Rel = ELECTRE_Tri_B.relations_arrays(CRED_AB[:, np.newaxis, :], CRED_BA[:, np.newaxis, :], Points[:, :, np.newaxis])
+    Pessi_cat, Opti_cat = ELECTRE_Tri_B.sorting_arrays(Rel, q)
+    Pessi_ref, Opti_ref = ELECTRE_Tri_B.sorting_arrays(ELECTRE_Tri_B.relations_arrays(CRED_AB, CRED_BA, λ), q)
+    Changed = (Pessi_cat != Pessi_ref[:, np.newaxis]) | (Opti_cat != Opti_ref[:, np.newaxis])
+    t0 = (Points < λ).sum(axis=1)
+    Index = np.arange(Points.shape[1])
+    # Last interval with other categories below λ, and first one above λ
+    Below = Changed & (Index <= t0[:, np.newaxis])
+    Above = Changed & (Index >= t0[:, np.newaxis])
+    t_min = Points.shape[1] - 1 - np.argmax(Below[:, ::-1], axis=1)
+    t_max = np.argmax(Above, axis=1)
+    Lambda_min = np.where(Below.any(axis=1), Points[np.arange(n), t_min], 0.0)
+    Lambda_max = np.where(Above.any(axis=1), Points[np.arange(n), np.maximum(t_max - 1, 0)], 1.0)
+    return Lambda_min, Lambda_max
+
+
+def weight_margins_arrays(CONC_AB, CONC_BA, DISC_AB, DISC_BA, W, λ, q):
+    """
+    Calculates, for each action and each criterion, the smallest increase and decrease of the weighting of this
+        criterion alone which changes the pessimistic or optimistic category of the action. When the weighting wj
+        changes by δ, the global concordance index becomes (W * C + δ * cj) / (W + δ), which moves monotonically
+        towards cj: each relation changes at most once, for the value of δ at which the global concordance index
+        crosses the threshold given by "concordance_thresholds". The categories are then calculated on each interval
+        between these values of δ. A weighting decreased to zero is decided by the exact calculation of the categories
+        with this weighting equal to zero.
+
+    :param CONC_AB: Array of shape (actions, boundaries, criteria) containing the concordance indices c(ai,bk).
+    :param CONC_BA: Array of shape (actions, boundaries, criteria) containing the concordance indices c(bk,ai).
+    :param DISC_AB: Array of shape (actions, boundaries, criteria) containing the discordance indices d(ai,bk).
+    :param DISC_BA: Array of shape (actions, boundaries, criteria) containing the discordance indices d(bk,ai).
+    :param W: Array of shape (criteria,) containing the weightings of each criterion.
+    :param λ: Cutting threshold value.
+    :param q: Number of categories.
+
+    :return Increase: Array of shape (actions, criteria) containing the smallest increase of each weighting which
+        changes a category, or inf if no increase changes them.
+    :return Decrease: Array of shape (actions, criteria) containing the smallest decrease of each weighting which
+        changes a category, or inf if the categories are the same down to a weighting of zero.
+    """
+    n, K, m = CONC_AB.shape
+    W_sum = sum(W.tolist())
+    Glob_ab, Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(CONC_AB, CONC_BA, W)
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_arrays(Glob_ab, Glob_ba, DISC_AB, DISC_BA)
+    Pessi_ref, Opti_ref = ELECTRE_Tri_B.sorting_arrays(ELECTRE_Tri_B.relations_arrays(Cred_ab, Cred_ba, λ), q)
+    # The pairs (ai,bk) and (bk,ai) side by side
+    Glob = np.concatenate([Glob_ab, Glob_ba], axis=1)
+    C_min = np.concatenate([ELECTRE_Tri_B.concordance_thresholds(DISC_AB, λ),
+                            ELECTRE_Tri_B.concordance_thresholds(DISC_BA, λ)], axis=1)
+
+    def changed(Conc, Δ):
+        # Categories for the changes Δ of shape (actions, points) of the weighting of the criterion
+        Glob_Δ = (Glob[:, np.newaxis, :] * W_sum + Δ[..., np.newaxis] * Conc[:, np.newaxis, :]) / \
+            (W_sum + Δ[..., np.newaxis])
+        Outranking = (Glob_Δ >= C_min[:, np.newaxis, :] - TOLERANCE).astype(np.int8)
+        Pessi_cat, Opti_cat = ELECTRE_Tri_B.sorting_arrays(Outranking[..., :K] | (Outranking[..., K:] << 1), q)
+        return (Pessi_cat != Pessi_ref[:, np.newaxis]) | (Opti_cat != Opti_ref[:, np.newaxis])
+
+    def first_change(Conc, Δ, Points):
+        # First value of Δ, sorted by increasing magnitude, after which the categories change
+        Changed = changed(Conc, Points) & np.isfinite(Points)
+        t = np.argmax(Changed, axis=1)
+        return np.where(Changed.any(axis=1), np.abs(Δ[np.arange(n), t]), np.inf)
+
+    Increase = np.full((n, m), np.inf)
+    Decrease = np.full((n, m), np.inf)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j in range(m):
+            Conc = np.concatenate([CONC_AB[..., j], CONC_BA[..., j]], axis=1)
+            # Values of δ at which the global concordance index of each pair crosses its threshold
+            Δ = W_sum * (C_min - Glob) / (Conc - C_min)
+            Δ_up = np.sort(np.where(np.isfinite(Δ) & (Δ >= 0), Δ, np.inf), axis=1)
+            Δ_down = -np.sort(-np.where(np.isfinite(Δ) & (Δ <= 0) & (Δ > -W[j]), Δ, -np.inf), axis=1)
+            # Only the columns containing at least one value of δ are kept
+            Δ_up = Δ_up[:, :max(np.isfinite(Δ_up).sum(axis=1).max(initial=0), 1)]
+            Δ_down = Δ_down[:, :max(np.isfinite(Δ_down).sum(axis=1).max(initial=0), 1)]
+            # The categories are tested between two consecutive values of δ, and beyond the last one
+            Next_up = np.concatenate([Δ_up[:, 1:], np.full((n, 1), np.inf)], axis=1)
+            Points_up = np.where(np.isfinite(Next_up), (Δ_up + Next_up) / 2, Δ_up + np.maximum(Δ_up, 1))
+            Increase[:, j] = first_change(Conc, Δ_up, Points_up)
+            if W_sum - W[j] > 0:
+                # The last interval ends at a weighting of zero
+                Next_down = np.concatenate([Δ_down[:, 1:], np.full((n, 1), -np.inf)], axis=1)
+                Next_down = np.where(np.isfinite(Next_down), Next_down, -W[j])
+                Points_down = np.where(np.isfinite(Δ_down), (Δ_down + Next_down) / 2, np.nan)
+                Decrease[:, j] = first_change(Conc, Δ_down, Points_down)
+                # A weighting of zero, at which a relation can change exactly, is decided without tolerance
+                W_zero = W.copy()
+                W_zero[j] = 0
+                Glob_ab, Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(CONC_AB, CONC_BA, W_zero)
+                Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_arrays(Glob_ab, Glob_ba, DISC_AB, DISC_BA)
+                Pessi_zero, Opti_zero = ELECTRE_Tri_B.sorting_arrays(
+                    ELECTRE_Tri_B.relations_arrays(Cred_ab, Cred_ba, λ), q)
+                Changed_zero = (Pessi_zero != Pessi_ref) | (Opti_zero != Opti_ref)
+                Decrease[:, j] = np.where(np.isinf(Decrease[:, j]) & Changed_zero, W[j], Decrease[:, j])
+    return Increase, Decrease
+
+
+def stability_margins(C, W=None, A=None, AP=None, B=None, BP=None, T=None, CAT=None, λ=None, display='NO'):
+    """
+    Stability analysis of the assignments, derived from the credibility and global concordance indices without
+        running the method again: the interval of the cutting threshold over which the categories of each action stay
+        the same (see "lambda_intervals_arrays"), and the smallest change of each single weighting which changes them
+        (see "weight_margins_arrays"). As for "ELECTRE_Tri_B", the data can be given as a single Problem instance in
+        place of C.
+
+    :param C: List containing the names of the criteria as strings, or Problem instance.
+    :param W: Dictionary containing the weightings of each criterion.
+    :param A: List containing the names of the actions as strings.
+    :param AP: Actions performances dictionary.
+    :param B: List containing the names of the boundary reference actions.
+    :param BP: Dictionary of the Boundaries reference actions performances.
+    :param T: Dictionary of thresholds.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param display: Parameter allowing to choose if the display of the results is desired or not.
+
+    :return Lambda_interval: Dictionary containing for each action the tuple (λ_min, λ_max) such that its categories
+        are the same for all the cutting thresholds in ]λ_min, λ_max]. The cutting threshold must also respect the
+        requirements of "requirements_test".
+    :return Weight_margins: Dictionary containing for each action a dictionary giving for each criterion the tuple
+        (decrease, increase) of the smallest changes of the weighting which change its categories, inf if none.
+    """
+    PB = ELECTRE_Tri_B.as_problem(C, W, A, AP, B, BP, T)
+    if CAT is None or λ is None:
+        raise NameError('The categories "CAT" and the cutting threshold "λ" must be given')
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    q = len(CAT)
+    Conc_ab, Conc_ba, Disc_ab, Disc_ba = ELECTRE_Tri_B.partial_indices_arrays(PB.AP, PB.BP, PB.T)
+    Glob_ab, Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(Conc_ab, Conc_ba, PB.W)
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_arrays(Glob_ab, Glob_ba, Disc_ab, Disc_ba)
+    Lambda_min, Lambda_max = lambda_intervals_arrays(Cred_ab, Cred_ba, λ, q)
+    Increase, Decrease = weight_margins_arrays(Conc_ab, Conc_ba, Disc_ab, Disc_ba, PB.W, λ, q)
+
+    Lambda_interval = {a: (float(Lambda_min[i]), float(Lambda_max[i])) for i, a in enumerate(PB.A)}
+    Weight_margins = {a: {c: (float(Decrease[i, j]), float(Increase[i, j])) for j, c in enumerate(PB.C)}
+                      for i, a in enumerate(PB.A)}
+
+    if display == 'YES':
+        print(' ')
+        for a in PB.A:
+            print('Action ' + a + ' λ interval :', tuple(round(x, 4) for x in Lambda_interval[a]),
+                  'weightings margins :', {c: tuple(round(x, 3) for x in Weight_margins[a][c]) for c in PB.C})
+
+    return Lambda_interval, Weight_margins
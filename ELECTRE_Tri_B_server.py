@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 21:30
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import numpy as np
+import argparse
+import concurrent.futures
+import http.server
+import json
+import queue
+import sys
+import threading
+import time
+
+
+class Model:
+    """
+    Preloaded classification model: the criteria, weightings, boundary reference actions, thresholds, categories and
+        cutting threshold are loaded and the minimum requirements are tested once, so that each classification only
+        calculates the indices of the new actions.
+
+    :param PB: Problem instance, whose actions are ignored.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    """
+
+    def __init__(self, PB, CAT, λ, backend=None):
+        self.PB = PB.with_actions([], np.empty((0, len(PB.C))))
+        self.CAT = list(CAT)
+        self.λ = λ
+        self.Stages = ELECTRE_Tri_B.get_backend(backend)
+        self.Sigma_bk, self.Separability = ELECTRE_Tri_B.requirements_test(PB.C, PB.weights_dict(), PB.B,
+                                                                           PB.boundaries_dict(), PB.thresholds_dict(),
+                                                                           λ)
+
+    @classmethod
+    def from_files(cls, name_W, name_BP, name_T, CAT, λ, backend=None):
+        """
+        :param name_W: Name of the .csv file containing the names of the criteria and the weightings.
+        :param name_BP: Name of the .csv file containing the names and performances of the boundaries actions.
+        :param name_T: Name of the .csv file containing the thresholds of each criterion.
+
+        :return: Model instance loaded from the same .csv files as "input_data".
+        """
+        return cls(ELECTRE_Tri_B.input_boundaries(name_W, name_BP, name_T), CAT, λ, backend)
+
+    def performances(self, AP):
+        """
+        :param AP: Actions performances dictionary, as returned by "input_data", for the actions of a request.
+
+        :return A: List containing the names of the actions.
+        :return G_A: Array of shape (actions, criteria) containing the actions performances.
+        """
+        A = list(AP)
+        try:
+            G_A = np.array([[AP[a][c] for c in self.PB.C] for a in A], dtype=np.float64).reshape(len(A), len(self.PB.C))
+        except KeyError as error:
+            raise NameError('The performance of each action must be given for the criterion {}'.format(error))
+        return A, G_A
+
+    def classify(self, G_A):
+        """
+        :param G_A: Array of shape (actions, criteria) containing the actions performances.
+
+        :return: Pessi_cat, Opti_cat integer arrays of the categories of the actions, numbered from 1, or 0 if the
+            action could not be assigned.
+        """
+        PB = self.PB
+        Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_indices(G_A, PB.BP, PB.T, PB.W, self.Stages)
+        return self.Stages['sorting'](Cred_ab, Cred_ba, self.λ, len(self.CAT))
+
+
+class MicroBatcher:
+    """
+    Classifies the actions of concurrent requests in micro-batches: the requests received while a batch is being
+        collected, during at most max_wait seconds and up to max_batch actions, are classified with a single call to
+        the vectorized engine. The model can be replaced at any time; each request is classified with the model in use
+        when it was submitted.
+
+    :param model: Model instance.
+    :param max_batch: Maximum number of actions in a batch.
+    :param max_wait: Maximum time in seconds waited for other requests before a batch is classified.
+    """
+
+    def __init__(self, model, max_batch=1024, max_wait=0.002):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.Requests = 0
+        self.Batches = 0
+        self.Latency = 0.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, AP):
+        """
+        :param AP: Actions performances dictionary of the actions of the request.
+
+        :return: Future giving the dictionary of the response, as described in "classify".
+        """
+        model = self.model
+        A, G_A = model.performances(AP)
+        future = concurrent.futures.Future()
+        self._queue.put((A, G_A, time.perf_counter(), future, model))
+        return future
+
+    def classify(self, AP):
+        """
+        :param AP: Actions performances dictionary of the actions of the request.
+
+        :return: Dictionary with the pessimistic and optimistic categories ('pessimistic', 'optimistic') and median
+            ranks ('median_rank') of the actions, None for the actions which could not be assigned, and the latency of
+            the request in seconds ('latency').
+        """
+        return self.submit(AP).result()
+
+    def stats(self):
+        """
+        :return: Dictionary with the number of requests, the number of batches, the mean number of requests by batch
+            and the mean latency in seconds.
+        """
+        with self._lock:
+            return {'requests': self.Requests, 'batches': self.Batches,
+                    'requests_by_batch': self.Requests / max(self.Batches, 1),
+                    'mean_latency': self.Latency / max(self.Requests, 1)}
+
+    def close(self):
+        """
+        Stops the thread of the batcher once the requests already submitted are classified.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            items = [item]
+            size = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+                size += len(item[0])
+            self._process(items)
+
+    def _process(self, items):
+        # The requests submitted before and after a reload are classified separately, each with its own model
+        Groups = {}
+        for item in items:
+            Groups.setdefault(id(item[4]), []).append(item)
+        for group in Groups.values():
+            self._process_group(group[0][4], group)
+        with self._lock:
+            self.Batches += 1
+
+    def _process_group(self, model, items):
+        try:
+            Pessi_cat, Opti_cat = model.classify(np.concatenate([item[1] for item in items]))
+            Med_rank = ELECTRE_Tri_B.median_rank_arrays(Pessi_cat, Opti_cat)
+        except Exception as error:
+            for item in items:
+                item[3].set_exception(error)
+            return
+        start = 0
+        end_time = time.perf_counter()
+        with self._lock:
+            self.Requests += len(items)
+            self.Latency += sum(end_time - item[2] for item in items)
+        for A, _, submit_time, future, _ in items:
+            pessi = Pessi_cat[start:start + len(A)].tolist()
+            opti = Opti_cat[start:start + len(A)].tolist()
+            med = Med_rank[start:start + len(A)].tolist()
+            start += len(A)
+            future.set_result({
+                'pessimistic': {a: model.CAT[p - 1] if p > 0 else None for a, p in zip(A, pessi)},
+                'optimistic': {a: model.CAT[o - 1] if o > 0 else None for a, o in zip(A, opti)},
+                'median_rank': {a: m if o > 0 and p > 0 else None for a, p, o, m in zip(A, pessi, opti, med)},
+                'latency': end_time - submit_time})
+
+
+class Server:
+    """
+    Local classification service answering JSON requests, either over HTTP or as JSON lines on the standard input.
+        A request is a JSON object of one of the following forms, the optional key "id" being copied in the response:
+            - {"actions": {"a1": {"g1": 12.5, "g2": 3.0, ...}, ...}}: classification of the actions,
+            - {"command": "reload"}: reloads the model from its .csv files, the current model being kept if the new
+                one is not valid,
+            - {"command": "stats"}: number of requests and batches and mean latency.
+        An error gives a response {"error": message}.
+
+    :param name_W: Name of the .csv file containing the names of the criteria and the weightings.
+    :param name_BP: Name of the .csv file containing the names and performances of the boundaries actions.
+    :param name_T: Name of the .csv file containing the thresholds of each criterion.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param max_batch: Maximum number of actions in a micro-batch.
+    :param max_wait: Maximum time in seconds waited for other requests before a micro-batch is classified.
+    """
+
+    def __init__(self, name_W, name_BP, name_T, CAT, λ, backend=None, max_batch=1024, max_wait=0.002):
+        self.files = (name_W, name_BP, name_T)
+        self.CAT = list(CAT)
+        self.λ = λ
+        self.backend = backend
+        self.batcher = MicroBatcher(Model.from_files(name_W, name_BP, name_T, CAT, λ, backend), max_batch, max_wait)
+
+    def reload(self):
+        """
+        Reloads the model from its .csv files. The requests already submitted are classified with the previous model.
+        """
+        self.batcher.model = Model.from_files(*self.files, self.CAT, self.λ, self.backend)
+
+    def handle(self, request):
+        """
+        :param request: Dictionary of the request.
+
+        :return: Dictionary of the response.
+        """
+        try:
+            if not isinstance(request, dict):
+                raise NameError('A request must be a JSON object')
+            if request.get('command') == 'reload':
+                self.reload()
+                response = {'reloaded': True}
+            elif request.get('command') == 'stats':
+                response = self.batcher.stats()
+            elif 'actions' in request:
+                response = self.batcher.classify(request['actions'])
+            else:
+                raise NameError('A request must contain "actions" or a "command" equal to "reload" or "stats"')
+        except Exception as error:
+            response = {'error': '{}: {}'.format(type(error).__name__, error)}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def serve_lines(self, infile=sys.stdin, outfile=sys.stdout, workers=32):
+        """
+        Answers the JSON lines read on infile, one request by line, and writes one JSON line by response on outfile.
+            The requests are handled concurrently, so that the responses may come in a different order than the
+            requests and should be matched with their "id".
+        """
+        lock = threading.Lock()
+
+        def answer(line):
+            try:
+                response = self.handle(json.loads(line))
+            except ValueError as error:
+                response = {'error': 'ValueError: {}'.format(error)}
+            with lock:
+                outfile.write(json.dumps(response) + '\n')
+                outfile.flush()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for line in infile:
+                if line.strip():
+                    pool.submit(answer, line)
+
+    def serve_http(self, host='127.0.0.1', port=8000):
+        """
+        Answers the requests sent with the POST method over HTTP, the body being the JSON object of the request,
+            until the process is interrupted.
+        """
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                except ValueError as error:
+                    request = None
+                    response = {'error': 'ValueError: {}'.format(error)}
+                if request is not None:
+                    response = server.handle(request)
+                body = json.dumps(response).encode('utf-8')
+                self.send_response(400 if 'error' in response else 200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        with http.server.ThreadingHTTPServer((host, port), Handler) as httpd:
+            httpd.serve_forever()
+
+    def close(self):
+        """
+        Stops the micro-batcher.
+        """
+        self.batcher.close()
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the classification service:
+        python ELECTRE_Tri_B_server.py 01_Weights.csv 03_Boundaries_actions_performances.csv 04_Thresholds.csv
+            --categories C1,C2,C3,C4,C5 --lambda 0.6 --port 8000
+
+    :param argv: List of the arguments, or None to use the arguments of the command line.
+    """
+    parser = argparse.ArgumentParser(description='Local ELECTRE Tri-B classification service.')
+    parser.add_argument('weights', help='.csv file of the criteria and weightings')
+    parser.add_argument('boundaries', help='.csv file of the boundary reference actions performances')
+    parser.add_argument('thresholds', help='.csv file of the thresholds')
+    parser.add_argument('--categories', required=True, help='names of the categories, from worst to best, '
+                                                             'separated by commas')
+    parser.add_argument('--lambda', dest='λ', type=float, required=True, help='cutting threshold value')
+    parser.add_argument('--port', type=int, default=None, help='HTTP port, JSON lines on the standard input if not '
+                                                               'given')
+    parser.add_argument('--host', default='127.0.0.1', help='HTTP host')
+    parser.add_argument('--backend', default=None, help='compute backend, "REFERENCE", "NUMPY" or "NUMBA"')
+    parser.add_argument('--max-batch', type=int, default=1024, help='maximum number of actions in a micro-batch')
+    parser.add_argument('--max-wait', type=float, default=0.002, help='maximum waiting time of a micro-batch in s')
+    args = parser.parse_args(argv)
+    CAT = [cat.strip() for cat in args.categories.split(',')]
+    server = Server(args.weights, args.boundaries, args.thresholds, CAT, args.λ, args.backend, args.max_batch,
+                    args.max_wait)
+    try:
+        if args.port is None:
+            server.serve_lines()
+        else:
+            server.serve_http(args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 10:12
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import numpy as np
+import codecs
+import csv
+import io
+import itertools
+
+
+def _header_length(name_AP, block_size):
+    """
+    Finds the length in bytes of the first line of a .csv file without reading the whole line in memory.
+
+    :param name_AP: Name of the .csv file.
+    :param block_size: Number of bytes read at once.
+
+    :return: Position in bytes of the beginning of the second line.
+    """
+    length = 0
+    with open(name_AP, 'rb') as AP_csv:
+        while True:
+            block = AP_csv.read(block_size)
+            if not block:
+                return length
+            end = block.find(b'\n')
+            if end >= 0:
+                return length + end + 1
+            length += len(block)
+
+
+def _header_names(AP_csv, block_size):
+    """
+    Generator giving one by one the names written on the first line of an open .csv file, without reading the whole
+        line in memory. The names must be separated by commas and must not be quoted.
+
+    :param AP_csv: .csv file opened in binary mode and positioned at its beginning.
+    :param block_size: Number of bytes read at once.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    rest = ''
+    while True:
+        block = AP_csv.read(block_size)
+        text = decoder.decode(block, final=not block)
+        end = text.find('\n')
+        if end >= 0 or not block:
+            if end >= 0:
+                text = text[:end]
+            yield from (rest + text).rstrip('\r').split(',')
+            return
+        names = (rest + text).split(',')
+        rest = names.pop()
+        yield from names
+
+
+def read_actions(name_AP, C, chunk_size=10000, block_size=65536):
+    """
+    Generator reading the actions performances .csv file by chunks of a fixed number of actions. Only one chunk is
+        kept in memory at a time, including for the names of the actions written on the first line of the file.
+
+    :param name_AP: Name of the .csv file which must contain on the first line the names of the possibles actions and
+        on the following lines the performance of each action against each criterion.
+    :param C: List containing the names of the criteria as strings.
+    :param chunk_size: Number of actions in each chunk.
+    :param block_size: Number of bytes read at once in the first line of the file.
+
+    :return: Successive tuples (A_chunk, AP_chunk) where A_chunk is the list of the names of the actions of the chunk
+        and AP_chunk the array of shape (actions, criteria) of their performances.
+    """
+    if chunk_size < 1:
+        raise NameError('The size of the chunks must be at least equal to 1')
+    offset = _header_length(name_AP, block_size)
+    with open(name_AP, 'rb') as names_csv, open(name_AP, 'rb') as rows_csv:
+        rows_csv.seek(offset)
+        names = _header_names(names_csv, block_size)
+        reader = (row for row in csv.reader(io.TextIOWrapper(rows_csv, encoding='utf-8', newline=''), delimiter=',')
+                  if row)
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            A_chunk = list(itertools.islice(names, len(rows)))
+            if len(A_chunk) != len(rows):
+                raise NameError('The number of actions names is lower than the number of performances lines')
+            AP_chunk = np.array(rows, dtype=np.float64)
+            if AP_chunk.shape != (len(rows), len(C)):
+                raise NameError('Each performances line must contain one value for each criterion')
+            yield A_chunk, AP_chunk
+        if next(names, None) is not None:
+            raise NameError('The number of actions names is greater than the number of performances lines')
+
+
+def boundary_model(name_W, name_BP, name_T, λ):
+    """
+    Precomputes everything that does not depend on the actions: imports the criteria, weightings, boundary reference
+        actions and thresholds and tests the minimum requirements to run the ELECTRE Tri-B method once for all chunks.
+
+    :param name_W: Name of the .csv file containing the names of the criteria and the weightings.
+    :param name_BP: Name of the .csv file containing the names and performances of the boundaries actions.
+    :param name_T: Name of the .csv file containing the thresholds of each criterion.
+    :param λ: Cutting threshold value.
+
+    :return PB: Problem instance without actions.
+    :return Sigma_bk: Dictionary containing the credibility index values for the pairs of boundary reference actions.
+    :return Separability: Variable stating whether the separability is "Weak", "Strict" or "Hyper-strict".
+    """
+    PB = ELECTRE_Tri_B.input_boundaries(name_W, name_BP, name_T)
+    Sigma_bk, Separability = ELECTRE_Tri_B.requirements_test(PB.C, PB.weights_dict(), PB.B, PB.boundaries_dict(),
+                                                             PB.thresholds_dict(), λ)
+    return PB, Sigma_bk, Separability
+
+
+def classify_chunk(PB, CAT, λ, backend=None, stats=None, precision='FLOAT64'):
+    """
+    Classifies the actions of a chunk without keeping the intermediate matrices once the categories are known.
+
+    :param PB: Problem instance containing the actions of the chunk.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param stats: Stats instance or function recording the measures of each stage (see "ELECTRE_Tri_B").
+    :param precision: "FLOAT64", or "FLOAT32" to calculate the outranking relations with "relations_float32".
+
+    :return Pessi_sort: Pessimistic sorting as returned by "pessimistic_sorting".
+    :return Opti_sort: Optimistic sorting as returned by "optimistic_sorting".
+    :return Med_rank: Dictionary containing the median rank of each action.
+    """
+    Stages = ELECTRE_Tri_B.get_backend(backend)
+    if precision == 'FLOAT32':
+        Rel, _ = ELECTRE_Tri_B.traced(stats, 'relations', ELECTRE_Tri_B.relations_float32, PB.AP, PB.BP, PB.T, PB.W,
+                                      λ, Stages)
+        Pessi_cat, Opti_cat = ELECTRE_Tri_B.traced(stats, 'sorting', ELECTRE_Tri_B.sorting_arrays, Rel, len(CAT))
+    else:
+        Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_indices(PB.AP, PB.BP, PB.T, PB.W, Stages, stats)
+        Pessi_cat, Opti_cat = ELECTRE_Tri_B.traced(stats, 'sorting', Stages['sorting'], Cred_ab, Cred_ba, λ,
+                                                   len(CAT))
+    Pessi_sort = ELECTRE_Tri_B.sorting_from_categories(Pessi_cat, CAT, PB.A)
+    Opti_sort = ELECTRE_Tri_B.sorting_from_categories(Opti_cat, CAT, PB.A)
+    Med_rank = ELECTRE_Tri_B.traced(stats, 'median_rank', ELECTRE_Tri_B.median_rank, Pessi_sort, Opti_sort, PB.A)
+    return Pessi_sort, Opti_sort, Med_rank
+
+
+def ELECTRE_Tri_B_stream(name_W, name_AP, name_BP, name_T, CAT, λ, name_out, chunk_size=10000, display='NO',
+                         backend=None, stats=None, precision='FLOAT64'):
+    """
+    Streaming version of the ELECTRE Tri-B method for very large actions files. The actions are read by chunks,
+        classified against the precomputed boundary model and their categories are written to the output .csv file
+        as they go, so that the peak memory depends on the size of the chunks and not on the number of actions.
+
+    :param name_W: Name of the .csv file containing the names of the criteria and the weightings.
+    :param name_AP: Name of the .csv file containing the names and performances of the actions.
+    :param name_BP: Name of the .csv file containing the names and performances of the boundaries actions.
+    :param name_T: Name of the .csv file containing the thresholds of each criterion.
+    :param CAT: List of the names of the different categories in which the actions will be classified.
+    :param λ: Cutting threshold value.
+    :param name_out: Name of the output .csv file. Each line contains the name of an action, its pessimistic
+        category, its optimistic category and its median rank.
+    :param chunk_size: Number of actions classified at once.
+    :param display: Parameter allowing to choose if the display of the progress is desired or not.
+    :param backend: Name of the compute backend, "REFERENCE", "NUMPY" or "NUMBA" (see "get_backend").
+    :param stats: Stats instance or function recording the measures of each stage, for all the chunks.
+    :param precision: "FLOAT64", or "FLOAT32" to classify the chunks in reduced precision (see "classify_chunk"), with
+        the same categories.
+
+    :return N: Number of classified actions.
+    :return Sigma_bk: Dictionary containing the credibility index values for the pairs of boundary reference actions.
+    :return Separability: Variable stating whether the separability is "Weak", "Strict" or "Hyper-strict".
+    """
+    if display != 'YES' and display != 'NO':
+        raise NameError('The choice of displaying the results must be indicated by "YES" or "NO"')
+    if precision != 'FLOAT64' and precision != 'FLOAT32':
+        raise NameError('The variable "precision" must be equal to "FLOAT64" or "FLOAT32"')
+    PB, Sigma_bk, Separability = ELECTRE_Tri_B.traced(stats, 'requirements', boundary_model, name_W, name_BP,
+                                                      name_T, λ)
+    N = 0
+    with open(name_out, 'w', newline='') as out_csv:
+        writer = csv.writer(out_csv, delimiter=',')
+        writer.writerow(['Action', 'Pessimistic category', 'Optimistic category', 'Median rank'])
+        for A_chunk, AP_chunk in read_actions(name_AP, PB.C, chunk_size):
+            Pessi_sort, Opti_sort, Med_rank = classify_chunk(PB.with_actions(A_chunk, AP_chunk), CAT, λ, backend,
+                                                             stats, precision)
+            writer.writerows([a, CAT[Pessi_sort[1][a] - 1], CAT[Opti_sort[1][a] - 1], Med_rank[a]] for a in A_chunk)
+            N += len(A_chunk)
+            if display == 'YES':
+                print('{} actions classified'.format(N))
+    return N, Sigma_bk, Separability
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026 at 23:50
+
+@author: sdaniel
+"""
+
+import ELECTRE_Tri_B
+import ELECTRE_Tri_B_benchmark
+import ELECTRE_Tri_B_robustness
+import numpy as np
+
+
+def _categories(Partial_indices, W, λ, q):
+    Glob_ab, Glob_ba = ELECTRE_Tri_B.global_concordance_arrays(Partial_indices[0], Partial_indices[1], W)
+    Cred_ab, Cred_ba = ELECTRE_Tri_B.credibility_arrays(Glob_ab, Glob_ba, Partial_indices[2], Partial_indices[3])
+    return ELECTRE_Tri_B.sorting_arrays(ELECTRE_Tri_B.relations_arrays(Cred_ab, Cred_ba, λ), q)
+
+
+def test_decrease_margins_at_zero_weighting():
+    """
+    The decrease margins are infinite exactly when setting the weighting to zero does not change the categories.
+    """
+    PB, CAT = ELECTRE_Tri_B_benchmark.generate_problem(60, 5, 4, seed=3)
+    Partial_indices = ELECTRE_Tri_B.partial_indices_arrays(PB.AP, PB.BP, PB.T)
+    for λ in (0.55, 0.7, 0.85):
+        Pessi_ref, Opti_ref = _categories(Partial_indices, PB.W, λ, len(CAT))
+        _, Decrease = ELECTRE_Tri_B_robustness.weight_margins_arrays(*Partial_indices, PB.W, λ, len(CAT))
+        for j in range(len(PB.C)):
+            W_zero = PB.W.copy()
+            W_zero[j] = 0
+            Pessi_cat, Opti_cat = _categories(Partial_indices, W_zero, λ, len(CAT))
+            Changed = (Pessi_cat != Pessi_ref) | (Opti_cat != Opti_ref)
+            # Without change at zero, a finite margin must come from a change before the weighting reaches zero
+            assert np.all(Changed | np.isinf(Decrease[:, j]) | (Decrease[:, j] < PB.W[j]))
+            assert np.all(~Changed | np.isfinite(Decrease[:, j]))
+    a19, g2 = PB.A.index('a19'), PB.C.index('g2')
+    assert np.isinf(ELECTRE_Tri_B_robustness.weight_margins_arrays(*Partial_indices, PB.W, 0.7, len(CAT))[1][a19, g2])